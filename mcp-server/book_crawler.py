@@ -16,12 +16,20 @@ Playwright 기반 도서 검색, 대출 확인, 픽업 서비스 신청
 """
 
 import asyncio
+import contextlib
+import copy
+import functools
+import logging
 import re
+import time
 import urllib.parse
+from collections import OrderedDict
 from typing import Optional, List, Dict, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from playwright.async_api import async_playwright, Browser, Page, BrowserContext
 
+logger = logging.getLogger(__name__)
+
 # ----------------------------
 # 설정
 # ----------------------------
@@ -32,8 +40,361 @@ SEARCH_URL = f"{BASE_URL}/searchTotal/result"
 DETAIL_URL = f"{BASE_URL}/search/detail"
 LOGIN_URL = f"{BASE_URL}/login"
 
+# 페이지 준비 완료 판단용 셀렉터 (networkidle 대신 사용)
+LOGIN_READY_SELECTOR = 'input#id'
+SEARCH_READY_SELECTOR = 'a[href*="/search/detail/"], .result-list li, .no-result'
+DETAIL_READY_SELECTOR = '.book-title, .holding-table, .titleArea'
+BRANCH_LINK_SELECTOR = 'a[href*="/search/branch/form"]'
+BRANCH_LINK_IMG_SELECTOR = 'a:has(img[alt*="분관대출"]), a:has(img[title*="분관대출"])'
+# 분관대출 신청 전 상세 페이지 준비 완료 (링크 또는 소장 상태 표시 - 신청 대상이 아닌 도서도 바로 판단)
+BRANCH_READY_SELECTOR = (
+    f'{BRANCH_LINK_SELECTOR}, {BRANCH_LINK_IMG_SELECTOR}, .holding-table, '
+    ':text-matches("대출가능|대출중|대출불가|소장정보가 없습니다")'
+)
+BRANCH_FORM_READY_SELECTOR = 'select#receiveLoc, select[name="receiveLoc"], #submitButton'
+# 로그인 실패 메시지 요소 (우선순위 순)
+LOGIN_ERROR_SELECTORS = ['.error', '.alert', '.message', '.login-error', '.err-msg']
+# 분관대출 신청 후 성공/실패 표시 요소
+PICKUP_RESULT_SELECTOR = 'table tbody tr, .error, .alert, .message, .err-msg, :text-matches("완료|실패|오류|신청되었습니다")'
+
+# 분관대출 현황 테이블 행 셀렉터 (후보를 하나로 합쳐 한 번에 조회)
+_LOAN_ROW_SELECTOR = 'table tbody tr, .loan-list tr, .list-table tr, .dataTable tr, table.list tr'
+
+# 분관대출 수령 분관 코드
+BRANCH_CODES = {
+    "농학도서관": "AL000000",
+    "법학도서관": "LL000000",
+    "의학도서관": "ML000000"
+}
+
+# 분관 별칭 → 분관명 (분관명, 약칭, 코드로 바로 조회)
+_BRANCH_ALIASES = {
+    "농학도서관": "농학도서관", "농학": "농학도서관", "농도": "농학도서관", "AL": "농학도서관", "AL000000": "농학도서관",
+    "법학도서관": "법학도서관", "법학": "법학도서관", "법도": "법학도서관", "LL": "법학도서관", "LL000000": "법학도서관",
+    "의학도서관": "의학도서관", "의학": "의학도서관", "의도": "의학도서관", "ML": "의학도서관", "ML000000": "의학도서관"
+}
+
+# 파싱용 정규식 (모듈 로드 시 1회 컴파일)
+_RE_COUNT = re.compile(r'(\d[\d,]*)')
+_RE_BOOK_ID = re.compile(r'recKey=(\d+)|id=(\d+)|book_id=(\d+)')
+_RE_RETURN_DATE = re.compile(r'(\d{4}[-/.]\d{2}[-/.]\d{2}|\d{2}[-/.]\d{2})')
+_RE_LINE_KEYWORD = re.compile(r'저자|지음|출판|대출가능|대출중')
+_RE_PICKUP_SUCCESS = re.compile(r'완료|성공|신청되었습니다|접수|등록')
+_RE_PICKUP_ERROR = re.compile(r'실패|오류|에러|불가|없습니다|권한')
+_RE_NO_LOANS = re.compile(r'신청내역이 없습니다|데이터가 없습니다')
+
+# 검색 결과 수 / 도서 목록 / 제목 / 소장 테이블 셀렉터 (브라우저·HTTP 경로 공용, 우선순위 순)
+_COUNT_SELECTORS = [
+    '.result-count', '.search-count', '.total-count',
+    '.result_count', '#totalCount', '.resultCount',
+    'span.count', '.search-result-count'
+]
+_ITEM_SELECTORS = [
+    '.result-list li',
+    '.search-result-item',
+    '.book-item',
+    '.list-item',
+    'ul.list li',
+    '.resultList li',
+    '.search-list > li',
+    '.data-list li',
+    'div.result > ul > li',
+    '.searchResultList li',
+    'article.result',
+    '.book-list li'
+]
+_TITLE_SELECTORS = ['.book-title', '.detail-title', 'h1.title', 'h2.title', '.tit', '.book-name']
+_AVAIL_TITLE_SELECTORS = _TITLE_SELECTORS + ['.titleArea']
+_TABLE_SELECTORS = [
+    '.holding-table tr',
+    '.location-table tbody tr',
+    'table.holdings tr',
+    '.book-info table tr',
+    'table tr'
+]
+
+# 대출가능 / 대출중 상태 요소
+# 브라우저 경로는 :has-text 셀렉터, HTTP 경로는 같은 조건의 (css, 포함 텍스트) 후보 사용
+_AVAILABLE_STATUS_SELECTOR = 'span.status.available, span.available, .status:has-text("대출가능")'
+_UNAVAILABLE_STATUS_SELECTOR = 'span.status.onloan, span.status.unavailable, .status:has-text("대출중")'
+_AVAILABLE_STATUS_CANDIDATES = [('span.status.available', None), ('span.available', None), ('.status', '대출가능')]
+_UNAVAILABLE_STATUS_CANDIDATES = [('span.status.onloan', None), ('span.status.unavailable', None), ('.status', '대출중')]
+
+# 검색 결과 항목의 필드별 셀렉터
+_BOOK_FIELD_SELECTORS = {
+    "title": '.title a, .book-title, td.title a, a.title',
+    "status": '.status, .loan-status, td.status, .availability',
+    "author": '.author, .book-author, td.author',
+    "publisher": '.publisher, .book-publisher, td.publisher',
+    "year": '.year, .pub-year, td.year',
+    "call_number": '.call-number, .callno, td.callno',
+    "location": '.location, .lib-name, td.location'
+}
+
+# 검색 결과 항목 1건의 필드 추출 JS (f: _BOOK_FIELD_SELECTORS, status는 요소가 없으면 null)
+_BOOK_ITEM_JS = """(el, f) => {
+    const find = (s) => el.querySelector(s);
+    const text = (s) => { const e = find(s); return e ? (e.textContent || '').trim() : ''; };
+    const titleEl = find(f.title);
+    const statusEl = find(f.status);
+    return {
+        title: titleEl ? (titleEl.textContent || '').trim() : '',
+        href: titleEl ? titleEl.getAttribute('href') : null,
+        author: text(f.author),
+        publisher: text(f.publisher),
+        year: text(f.year),
+        call_number: text(f.call_number),
+        location: text(f.location),
+        status: statusEl ? (statusEl.textContent || '').trim() : null
+    };
+}"""
+
+# 셀렉터 목록 각각의 첫 요소 textContent (없으면 null)
+_FIRST_TEXTS_JS = """sels => sels.map(s => {
+    const e = document.querySelector(s);
+    return e ? (e.textContent || '') : null;
+})"""
+
+# 로그인 실패 메시지가 새로 나타났는지 (제출 전 _FIRST_TEXTS_JS 결과와 비교, 비어 있지 않은 다른 텍스트)
+# 인자: [셀렉터 목록, 제출 전 텍스트 목록]
+_LOGIN_ERROR_SHOWN_JS = """([sels, before]) => sels.some((s, i) => {
+    const e = document.querySelector(s);
+    const t = e ? (e.textContent || '').trim() : '';
+    return t !== '' && t !== (before[i] || '').trim();
+})"""
+
+# 대출 상태 요소별 텍스트 + 부모 행(tr/li) 첫 줄(위치)
+_STATUS_ROWS_JS = """nodes => nodes.map(el => {
+    const row = el.closest('tr') || el.closest('li') || el.parentElement;
+    const rowText = row ? (row.innerText || '') : '';
+    return {text: el.textContent || '', location: rowText.split('\\n')[0]};
+})"""
+
+# 소장 테이블 행 → {location, call_number, status} (첫 행은 헤더, td 2개 미만 행은 제외)
+_HOLDING_ROWS_JS = """rows => rows.slice(1).map(r => r.querySelectorAll('td')).filter(tds => tds.length >= 2).map(tds => ({
+    location: (tds[0].textContent || '').trim(),
+    call_number: (tds[1].textContent || '').trim(),
+    status: (tds[tds.length - 1].textContent || '').trim()
+}))"""
+
+# 셀렉터 목록 중 소장 정보가 처음 나오는 것의 행들을 _HOLDING_ROWS_JS로 추출
+_FIRST_HOLDINGS_JS = """sels => {
+    const extract = """ + _HOLDING_ROWS_JS + """;
+    for (const s of sels) {
+        const holdings = extract(Array.from(document.querySelectorAll(s)));
+        if (holdings.length) return {selector: s, holdings: holdings};
+    }
+    return null;
+}"""
+
+# 분관대출 현황 행 → {title, cols} (td 2개 미만이거나 제목 없는 행 제외)
+# 제목은 상세 링크 텍스트, 없으면 첫 번째 열
+_LOAN_ROWS_JS = """sel => Array.from(document.querySelectorAll(sel)).map(r => {
+    const cols = Array.from(r.querySelectorAll('td')).map(c => (c.textContent || '').trim());
+    const a = r.querySelector('a[href*="/search/detail"]');
+    const title = a ? (a.textContent || '').trim() : (cols[0] || '');
+    return {title: title, cols: cols};
+}).filter(x => x.cols.length >= 2 && x.title)"""
+
+# 정규식 패턴 목록 각각이 페이지 본문 텍스트에 있는지 여부
+_TEXT_MATCHES_JS = """patterns => {
+    const t = document.body ? (document.body.innerText || '') : '';
+    return patterns.map(p => new RegExp(p).test(t));
+}"""
+
+# 상세보기 링크 앞 max개 → {href, title, parent_text} (parent_text: 감싼 li 또는 부모 요소의 innerText)
+_DETAIL_LINKS_JS = """(links, max) => links.slice(0, max).map(a => {
+    const parent = a.closest('li') || a.parentElement;
+    return {
+        href: a.getAttribute('href'),
+        title: a.textContent,
+        parent_text: parent ? parent.innerText : null
+    };
+})"""
+
+# (css, text) 후보 목록을 순서대로 확인해 처음 매칭되는 요소 반환
+# text가 있으면 textContent에 해당 문자열을 포함하는 요소만 매칭 (:has-text 대체)
+_FIRST_MATCH_JS = """cands => {
+    for (const [css, text] of cands) {
+        for (const el of document.querySelectorAll(css)) {
+            if (!text || (el.textContent || '').includes(text)) return el;
+        }
+    }
+    return null;
+}"""
+
+# 셀렉터 목록 중 처음 매칭되는 것의 항목들을 _BOOK_ITEM_JS로 추출
+_FIRST_ITEMS_JS = """([sels, max, fields]) => {
+    const extract = """ + _BOOK_ITEM_JS + """;
+    for (const s of sels) {
+        const nodes = document.querySelectorAll(s);
+        if (nodes.length) {
+            return {selector: s, count: nodes.length, items: Array.from(nodes).slice(0, max).map(el => extract(el, fields))};
+        }
+    }
+    return null;
+}"""
+
+
+@functools.lru_cache(maxsize=1024)
+def _quote(query: str) -> str:
+    """검색어 URL 인코딩 (반복 검색어는 캐시 재사용)"""
+    return urllib.parse.quote(query)
+
+
+# ----------------------------
+# 조회 결과 캐시
+# ----------------------------
+class _TTLCache:
+    """
+    LRU + TTL 캐시 (공개 카탈로그 조회 결과 재사용)
+    저장/조회 모두 깊은 복사본을 사용 (호출자가 결과를 수정해도 캐시된 값은 그대로)
+    """
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()
+    
+    def get(self, key) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return copy.deepcopy(value)
+    
+    def set(self, key, value):
+        self._data[key] = (time.monotonic() + self.ttl, copy.deepcopy(value))
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+# 대출 상태는 자주 바뀌므로 짧게, 검색/상세는 길게 유지
+_SEARCH_CACHE = _TTLCache(maxsize=500, ttl=600)
+_DETAIL_CACHE = _TTLCache(maxsize=2000, ttl=900)
+_AVAIL_CACHE = _TTLCache(maxsize=1000, ttl=60)
+
+
+# ----------------------------
+# HTTP 조회 (선택: httpx + selectolax)
+# 검색/상세 페이지는 브라우저 렌더링 없이 HTML만 받아 같은 셀렉터로 파싱
+# ----------------------------
+try:
+    import httpx
+    from selectolax.parser import HTMLParser
+    HTTP_SCRAPE_AVAILABLE = True
+except ImportError:
+    HTTP_SCRAPE_AVAILABLE = False
+
+_HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+    "Accept-Language": "ko-KR,ko;q=0.9"
+}
+
+
+def _node_text(node) -> str:
+    """노드 textContent (없으면 빈 문자열)"""
+    return node.text(deep=True).strip() if node is not None else ""
+
+
+def _first_texts(tree, selectors: List[str]) -> List[Optional[str]]:
+    """셀렉터별 첫 요소 textContent (_FIRST_TEXTS_JS와 동일, 없으면 None)"""
+    texts = []
+    for sel in selectors:
+        node = tree.css_first(sel)
+        texts.append(node.text(deep=True) if node is not None else None)
+    return texts
+
+
+def _closest(node, tags: tuple):
+    """가장 가까운 조상 중 tags에 해당하는 요소 (없으면 None)"""
+    while node is not None and node.tag not in tags:
+        node = node.parent
+    return node
+
+
+def _book_item_from_node(node) -> Dict[str, Any]:
+    """검색 결과 항목 1건 필드 추출 (_BOOK_ITEM_JS와 같은 형태의 dict)"""
+    title_el = node.css_first(_BOOK_FIELD_SELECTORS["title"])
+    status_el = node.css_first(_BOOK_FIELD_SELECTORS["status"])
+    return {
+        "title": _node_text(title_el),
+        "href": title_el.attributes.get("href") if title_el is not None else None,
+        "author": _node_text(node.css_first(_BOOK_FIELD_SELECTORS["author"])),
+        "publisher": _node_text(node.css_first(_BOOK_FIELD_SELECTORS["publisher"])),
+        "year": _node_text(node.css_first(_BOOK_FIELD_SELECTORS["year"])),
+        "call_number": _node_text(node.css_first(_BOOK_FIELD_SELECTORS["call_number"])),
+        "location": _node_text(node.css_first(_BOOK_FIELD_SELECTORS["location"])),
+        "status": _node_text(status_el) if status_el is not None else None
+    }
 
-@dataclass
+
+def _parse_search_html(html: str, max_results: int) -> tuple:
+    """
+    검색 결과 HTML 파싱
+
+    Returns:
+        (검색 결과 수, 항목 dict 목록)
+    """
+    tree = HTMLParser(html)
+
+    total_count = 0
+    for count_text in _first_texts(tree, _COUNT_SELECTORS):
+        if count_text is not None:
+            count_match = _RE_COUNT.search(count_text.replace(',', ''))
+            if count_match:
+                total_count = int(count_match.group(1))
+                break
+
+    for sel in _ITEM_SELECTORS:
+        nodes = tree.css(sel)
+        if nodes:
+            logger.debug("도서 목록 발견(HTTP): %s개 (selector: %s)", len(nodes), sel)
+            return total_count, [_book_item_from_node(node) for node in nodes[:max_results]]
+    return total_count, []
+
+
+def _status_rows(tree, candidates: List[tuple]) -> List[Dict[str, str]]:
+    """대출 상태 요소별 텍스트 + 부모 행(tr/li) 첫 줄 (_STATUS_ROWS_JS와 동일)"""
+    rows = []
+    seen = set()
+    for css, text in candidates:
+        for node in tree.css(css):
+            node_text = node.text(deep=True)
+            if node.mem_id in seen or (text and text not in node_text):
+                continue
+            seen.add(node.mem_id)
+            row = _closest(node, ("tr",)) or _closest(node, ("li",)) or node.parent
+            row_text = row.text(deep=True, separator="\n", strip=True) if row is not None else ""
+            rows.append({"text": node_text, "location": row_text.split("\n")[0]})
+    return rows
+
+
+def _parse_holdings_html(tree) -> List[Dict[str, str]]:
+    """소장 정보 테이블 파싱 (첫 행은 헤더로 제외)"""
+    holdings = []
+    for sel in _TABLE_SELECTORS:
+        rows = tree.css(sel)
+        if len(rows) > 1:
+            for row in rows[1:]:
+                cols = row.css('td')
+                if len(cols) >= 2:
+                    holdings.append({
+                        "location": _node_text(cols[0]),
+                        "call_number": _node_text(cols[1]),
+                        "status": _node_text(cols[-1])
+                    })
+            if holdings:
+                break
+    return holdings
+
+
+@dataclass(slots=True)
 class Book:
     """도서 정보"""
     title: str
@@ -48,14 +409,26 @@ class Book:
     detail_url: str  # 상세 페이지 URL
     
     def to_dict(self) -> Dict:
-        return asdict(self)
+        # 평면 레코드이므로 asdict의 재귀 deepcopy 없이 직접 구성
+        return {
+            "title": self.title,
+            "author": self.author,
+            "publisher": self.publisher,
+            "year": self.year,
+            "call_number": self.call_number,
+            "location": self.location,
+            "status": self.status,
+            "return_date": self.return_date,
+            "book_id": self.book_id,
+            "detail_url": self.detail_url
+        }
     
     @property
     def is_available(self) -> bool:
         return "대출가능" in self.status
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """검색 결과"""
     query: str
@@ -74,16 +447,218 @@ class SearchResult:
         }
 
 
+# 크롤링에 불필요한 리소스 유형 (요청 차단 대상)
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+
+
+async def _block_static_resources(route):
+    """불필요한 리소스 요청은 중단하고 나머지는 통과"""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# 크롤러용 Chromium 실행 옵션 (기동 시간 및 상주 메모리 절감)
+_LAUNCH_ARGS = [
+    "--disable-dev-shm-usage",
+    "--no-sandbox",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking"
+]
+
+
+class BrowserPool:
+    """
+    Chromium 프로세스 재사용 풀
+    브라우저는 최초 사용 시 1회만 실행하고, 요청마다 가벼운 BrowserContext를 발급
+    """
+    
+    def __init__(self):
+        self.playwright = None
+        self.browsers: Dict[bool, Browser] = {}  # headless 여부별 브라우저
+        self._lock = asyncio.Lock()
+    
+    async def _get_browser(self, headless: bool) -> Browser:
+        """공유 브라우저 가져오기 (없거나 끊겼으면 실행)"""
+        async with self._lock:
+            if self.playwright is None:
+                self.playwright = await async_playwright().start()
+            browser = self.browsers.get(headless)
+            if browser is None or not browser.is_connected():
+                browser = await self.playwright.chromium.launch(headless=headless, args=_LAUNCH_ARGS)
+                self.browsers[headless] = browser
+            return browser
+    
+    async def acquire(self, headless: bool = True) -> BrowserContext:
+        """새 BrowserContext 발급 (쿠키/스토리지 분리)"""
+        browser = await self._get_browser(headless)
+        context = await browser.new_context(
+            viewport={"width": 1280, "height": 800},
+            locale="ko-KR"
+        )
+        # 크롤러가 읽지 않는 이미지/폰트/미디어/CSS 요청 차단
+        await context.route("**/*", _block_static_resources)
+        return context
+    
+    async def release(self, context: BrowserContext):
+        """BrowserContext 반납 (브라우저는 유지)"""
+        try:
+            await context.close()
+        except Exception as e:
+            logger.debug("컨텍스트 종료 오류: %s", e)
+    
+    async def close(self):
+        """모든 브라우저 종료"""
+        for browser in self.browsers.values():
+            await browser.close()
+        self.browsers.clear()
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+
+
+POOL = BrowserPool()
+
+
+class ContextPool:
+    """
+    미리 만들어 둔 BrowserContext 풀 (동시 조회 수 제한 + 컨텍스트 생성 비용 제거)
+    컨텍스트는 max_uses회 사용 후 새로 교체해 메모리 증가 방지
+    """
+    
+    def __init__(self, browser_pool: BrowserPool, size: int = 4, max_uses: int = 50, close_timeout: float = 10.0,
+                 refill_interval: float = 1.0):
+        self.browser_pool = browser_pool
+        self.size = size
+        self.max_uses = max_uses
+        self.close_timeout = close_timeout
+        # 대기 중인 대여자가 빈 자리(교체 실패)를 확인하는 주기 (초)
+        self.refill_interval = refill_interval
+        self.headless = True
+        self._queue: "asyncio.Queue[BrowserContext]" = asyncio.Queue(maxsize=size)
+        self._uses: Dict[int, int] = {}  # id(context) → 사용 횟수
+        self._started = False
+        self._lock = asyncio.Lock()
+        # 대여 중인 컨텍스트 / 교체 중인 태스크 (종료 시 정리, 태스크는 GC되지 않도록 참조 보관)
+        self._checked_out: set = set()
+        self._recycle_tasks: set = set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        # 교체 실패로 비어 있는 자리 수 (대여/대기 중에 다시 생성 - 풀이 줄어든 채로 대여가 영원히 막히지 않도록)
+        self._missing = 0
+        # 대기 시간 통계
+        self.wait_count = 0
+        self.total_wait = 0.0
+    
+    async def start(self, headless: bool = True):
+        """컨텍스트 size개 미리 생성 (이미 시작했으면 무시)"""
+        async with self._lock:
+            if self._started:
+                return
+            self.headless = headless
+            for _ in range(self.size):
+                await self._add_context()
+            self._started = True
+    
+    async def _add_context(self):
+        ctx = await self.browser_pool.acquire(self.headless)
+        self._uses[id(ctx)] = 0
+        await self._queue.put(ctx)
+    
+    async def _refill(self):
+        """교체 실패로 빈 자리를 다시 채움 (실패하면 예외 - 호출자가 무한 대기하지 않도록)"""
+        async with self._lock:
+            if self._missing and self._queue.empty():
+                await self._add_context()
+                self._missing -= 1
+    
+    async def get(self) -> BrowserContext:
+        """
+        컨텍스트 대여 (모두 사용 중이면 반납될 때까지 대기)
+        기다리는 동안 교체에 실패한 자리가 생기면 직접 다시 생성 (생성 실패 시 예외)
+        """
+        started_at = time.monotonic()
+        while True:
+            if self._missing and self._queue.empty():
+                await self._refill()
+            try:
+                ctx = await asyncio.wait_for(self._queue.get(), timeout=self.refill_interval)
+                break
+            except asyncio.TimeoutError:
+                continue
+        waited = time.monotonic() - started_at
+        self.wait_count += 1
+        self.total_wait += waited
+        if waited > 0.01:
+            logger.debug("컨텍스트 대기 %.3fs (평균 %.3fs)", waited, self.total_wait / self.wait_count)
+        self._checked_out.add(ctx)
+        self._idle.clear()
+        return ctx
+    
+    async def put(self, ctx: BrowserContext):
+        """컨텍스트 반납 (사용 횟수 초과 시 백그라운드에서 교체, 종료 중이면 바로 닫음)"""
+        self._checked_out.discard(ctx)
+        if not self._checked_out:
+            self._idle.set()
+        if not self._started:
+            self._uses.pop(id(ctx), None)
+            await self.browser_pool.release(ctx)
+            return
+        uses = self._uses.get(id(ctx), 0) + 1
+        self._uses[id(ctx)] = uses
+        if uses >= self.max_uses:
+            task = asyncio.create_task(self._recycle(ctx))
+            self._recycle_tasks.add(task)
+            task.add_done_callback(self._recycle_tasks.discard)
+        else:
+            await self._queue.put(ctx)
+    
+    async def _recycle(self, ctx: BrowserContext):
+        """오래 쓴 컨텍스트를 닫고 새 컨텍스트로 교체 (실패하면 빈 자리로 기록)"""
+        self._uses.pop(id(ctx), None)
+        await self.browser_pool.release(ctx)
+        try:
+            await self._add_context()
+        except Exception as e:
+            self._missing += 1
+            logger.error("컨텍스트 교체 실패 (대여/대기 중에 다시 생성): %s", e)
+    
+    async def close(self):
+        """풀의 모든 컨텍스트 종료 (대여 중인 컨텍스트는 반납될 때까지 close_timeout초 대기)"""
+        self._started = False
+        if self._recycle_tasks:
+            await asyncio.gather(*self._recycle_tasks, return_exceptions=True)
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=self.close_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("반납되지 않은 컨텍스트 %d개 강제 종료", len(self._checked_out))
+            for ctx in list(self._checked_out):
+                await self.browser_pool.release(ctx)
+            self._checked_out.clear()
+            self._idle.set()
+        while not self._queue.empty():
+            await self.browser_pool.release(self._queue.get_nowait())
+        self._uses.clear()
+        self._missing = 0
+
+
+CONTEXT_POOL = ContextPool(POOL)
+
+
 class BookCrawler:
     """충남대 도서관 도서 크롤러"""
     
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, use_http: bool = True):
         self.headless = headless
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
         self.is_logged_in: bool = False
-        self.playwright = None
+        # 검색/상세 조회는 가능하면 HTTP로 (httpx, selectolax 설치 시)
+        self.use_http = use_http and HTTP_SCRAPE_AVAILABLE
+        self._http = None
     
     async def __aenter__(self):
         await self.start()
@@ -93,21 +668,124 @@ class BookCrawler:
         await self.close()
     
     async def start(self):
-        """브라우저 시작"""
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=self.headless)
-        self.context = await self.browser.new_context(
-            viewport={"width": 1280, "height": 800},
-            locale="ko-KR"
-        )
+        """브라우저 시작 (공유 브라우저에서 컨텍스트 발급)"""
+        self.context = await POOL.acquire(self.headless)
+        self.browser = self.context.browser
         self.page = await self.context.new_page()
+        await CONTEXT_POOL.start(self.headless)
     
     async def close(self):
-        """브라우저 종료"""
-        if self.browser:
-            await self.browser.close()
-        if self.playwright:
-            await self.playwright.stop()
+        """브라우저 종료 (컨텍스트만 닫고 브라우저는 풀에 유지)"""
+        if self._http:
+            await self._http.aclose()
+            self._http = None
+        if self.context:
+            await POOL.release(self.context)
+        self.context = None
+        self.page = None
+        self.is_logged_in = False
+    
+    @contextlib.asynccontextmanager
+    async def acquire_page(self):
+        """
+        요청 전용 페이지 발급 (CONTEXT_POOL의 컨텍스트 대여)
+        로그인이 필요 없는 조회는 기본 페이지를 거치지 않으므로 동시에 실행 가능
+        
+        사용법:
+            async with crawler.acquire_page() as (ctx, page):
+                await crawler.search_book("파이썬", page=page)
+        """
+        ctx = await CONTEXT_POOL.get()
+        page = None
+        try:
+            page = await ctx.new_page()
+            yield ctx, page
+        finally:
+            if page is not None:
+                await page.close()
+            await CONTEXT_POOL.put(ctx)
+    
+    async def _goto(self, url: str, ready_selector: str, timeout: int = 10000, page: Optional[Page] = None):
+        """
+        페이지 이동 후 준비 완료 요소 대기
+        (networkidle은 폴링/비콘이 있는 페이지에서 느리거나 발생하지 않음)
+        
+        Args:
+            url: 이동할 URL
+            ready_selector: 페이지 준비 완료를 나타내는 셀렉터
+            timeout: 셀렉터 대기 시간 (ms)
+            page: 사용할 페이지 (None이면 크롤러 기본 페이지)
+        """
+        page = page or self.page
+        await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+        try:
+            await page.wait_for_selector(ready_selector, timeout=timeout)
+        except Exception as e:
+            # 결과 없음 등으로 요소가 없을 수 있으므로 진행
+            logger.debug("준비 요소 대기 실패 (%s): %s", ready_selector, e)
+    
+    async def _fetch_html(self, url: str) -> Optional[str]:
+        """
+        브라우저 없이 HTML만 조회 (로그인 쿠키는 브라우저 컨텍스트와 공유)
+        
+        Args:
+            url: 조회할 URL
+        
+        Returns:
+            HTML 문자열 (HTTP 조회 불가 또는 실패 시 None)
+        """
+        if not self.use_http:
+            return None
+        try:
+            if self._http is None:
+                self._http = httpx.AsyncClient(headers=_HTTP_HEADERS, follow_redirects=True, timeout=10.0)
+            if self.context:
+                for cookie in await self.context.cookies(BASE_URL):
+                    self._http.cookies.set(cookie["name"], cookie["value"], domain=cookie["domain"], path=cookie["path"])
+            response = await self._http.get(url)
+            response.raise_for_status()
+            return response.text
+        except Exception as e:
+            logger.debug("HTTP 조회 실패, 브라우저로 진행 (%s): %s", url, e)
+            return None
+    
+    async def _query_first(self, candidates: List[tuple]):
+        """
+        (CSS 셀렉터, 포함 텍스트) 후보 중 우선순위가 가장 높은 요소 반환
+        셀렉터마다 query_selector를 반복하지 않고 한 번의 호출로 탐색
+        
+        Args:
+            candidates: [(css, text 또는 None), ...] 우선순위 순
+        
+        Returns:
+            ElementHandle 또는 None
+        """
+        handle = await self.page.evaluate_handle(_FIRST_MATCH_JS, candidates)
+        return handle.as_element()
+    
+    async def _wait_login_result(self, errors_before: List[Optional[str]], timeout: int = 10000):
+        """
+        로그인 제출 후 결과가 보일 때까지 대기 (먼저 끝나는 쪽 사용, 최대 timeout ms)
+        - 로그인 페이지를 벗어남 (wait_for_url은 load까지 대기)
+        - 오류 메시지 영역에 새 텍스트가 나타남 (실패 시 타임아웃까지 기다리지 않음)
+        """
+        waiters = {
+            asyncio.create_task(self.page.wait_for_url(lambda url: "login" not in url.lower(), timeout=timeout)),
+            asyncio.create_task(self.page.wait_for_function(
+                _LOGIN_ERROR_SHOWN_JS, arg=[LOGIN_ERROR_SELECTORS, errors_before], timeout=timeout
+            ))
+        }
+        try:
+            while waiters:
+                done, waiters = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+                # 한쪽이 실패(타임아웃, 이동 중 컨텍스트 소멸 등)하면 나머지를 계속 기다림
+                if any(task.exception() is None for task in done):
+                    return
+            logger.debug("로그인 후 페이지 이동/오류 메시지 없음")
+        finally:
+            for task in waiters:
+                task.cancel()
+            await asyncio.gather(*waiters, return_exceptions=True)
     
     async def login(self, user_id: str, password: str) -> Dict[str, Any]:
         """
@@ -121,68 +799,64 @@ class BookCrawler:
             로그인 결과
         """
         try:
-            print(f"[DEBUG] 로그인 시도: {user_id}")
-            await self.page.goto(LOGIN_URL, wait_until="networkidle", timeout=30000)
-            await asyncio.sleep(1)
+            logger.debug("로그인 시도: %s", user_id)
+            await self._goto(LOGIN_URL, LOGIN_READY_SELECTOR)
             
-            print(f"[DEBUG] 로그인 페이지 URL: {self.page.url}")
+            logger.debug("로그인 페이지 URL: %s", self.page.url)
             
             # 로그인 폼 입력
             # 아이디: <input id="id" name="id" ...>
             # 비밀번호: <input type="password" name="password" ...>
             
             await self.page.fill('input#id', user_id)
-            await asyncio.sleep(0.3)
-            
             await self.page.fill('input[name="password"]', password)
-            await asyncio.sleep(0.3)
-            
-            print(f"[DEBUG] 폼 입력 완료")
-            
-            # 로그인 버튼 클릭 (다양한 셀렉터 시도)
-            login_btn_selectors = [
-                'button[type="submit"]',
-                'input[type="submit"]',
-                '.btn-login',
-                '.login-btn',
-                'button:has-text("로그인")',
-                'a:has-text("로그인")',
-                '.btnLogin',
-                '#loginBtn'
+            
+            logger.debug("폼 입력 완료")
+            
+            # 제출 전 오류 메시지 영역 텍스트 (원래 있던 안내 문구를 실패로 오인하지 않도록)
+            errors_before = await self.page.evaluate(_FIRST_TEXTS_JS, LOGIN_ERROR_SELECTORS)
+            
+            # 로그인 버튼 클릭 (후보를 우선순위 순으로 한 번에 탐색)
+            login_btn_candidates = [
+                ('button[type="submit"]', None),
+                ('input[type="submit"]', None),
+                ('.btn-login', None),
+                ('.login-btn', None),
+                ('button', '로그인'),
+                ('a', '로그인'),
+                ('.btnLogin', None),
+                ('#loginBtn', None)
             ]
             
             clicked = False
-            for sel in login_btn_selectors:
+            btn = await self._query_first(login_btn_candidates)
+            if btn:
                 try:
-                    btn = await self.page.query_selector(sel)
-                    if btn:
-                        await btn.click()
-                        clicked = True
-                        print(f"[DEBUG] 로그인 버튼 클릭: {sel}")
-                        break
-                except:
-                    continue
+                    await btn.click()
+                    clicked = True
+                    logger.debug("로그인 버튼 클릭")
+                except Exception as e:
+                    logger.debug("로그인 버튼 클릭 실패: %s", e)
             
             if not clicked:
                 # Enter 키로 로그인 시도
                 await self.page.press('input[name="password"]', 'Enter')
-                print(f"[DEBUG] Enter 키로 로그인 시도")
+                logger.debug("Enter 키로 로그인 시도")
             
-            # 로그인 결과 확인 (페이지 이동 대기)
-            await self.page.wait_for_load_state("networkidle", timeout=10000)
-            await asyncio.sleep(2)
+            # 로그인 결과 확인 (로그인 페이지를 벗어나거나 오류 메시지가 나타날 때까지 대기)
+            await self._wait_login_result(errors_before)
             
             # 로그인 성공 여부 확인
             current_url = self.page.url
             page_content = await self.page.content()
             
-            print(f"[DEBUG] 로그인 후 URL: {current_url}")
+            logger.debug("로그인 후 URL: %s", current_url)
             
             # 성공 조건: 로그인 페이지가 아니고, 로그아웃 버튼이 있거나 마이페이지 링크가 있음
             if "login" not in current_url.lower():
                 if "로그아웃" in page_content or "logout" in page_content.lower() or "마이페이지" in page_content or "내정보" in page_content:
                     self.is_logged_in = True
-                    print(f"[DEBUG] 로그인 성공!")
+                    logger.debug("로그인 성공!")
                     return {
                         "success": True,
                         "message": "로그인 성공",
@@ -191,179 +865,72 @@ class BookCrawler:
             
             # 로그인 실패 원인 파악
             error_msg = "로그인 실패"
-            error_selectors = ['.error', '.alert', '.message', '.login-error', '.err-msg']
-            for sel in error_selectors:
-                err_elem = await self.page.query_selector(sel)
-                if err_elem:
-                    err_text = await err_elem.text_content()
-                    if err_text.strip():
-                        error_msg = err_text.strip()
-                        break
+            error_texts = await self.page.evaluate(_FIRST_TEXTS_JS, LOGIN_ERROR_SELECTORS)
+            error_msg = next((t.strip() for t in error_texts if t and t.strip()), error_msg)
             
-            print(f"[DEBUG] 로그인 실패: {error_msg}")
+            logger.debug("로그인 실패: %s", error_msg)
             return {
                 "success": False,
                 "message": f"로그인 실패 - {error_msg}"
             }
                 
         except Exception as e:
-            print(f"[DEBUG] 로그인 오류: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("로그인 오류: %s", e)
             return {
                 "success": False,
                 "message": f"로그인 오류: {str(e)}"
             }
     
-    async def search_book(self, query: str, max_results: int = 10) -> SearchResult:
+    async def search_book(self, query: str, max_results: int = 10, page: Optional[Page] = None) -> SearchResult:
         """
         도서 검색
         
         Args:
             query: 검색어 (도서명, 저자명 등)
             max_results: 최대 결과 수
+            page: 사용할 페이지 (None이면 크롤러 기본 페이지)
         
         Returns:
             SearchResult 객체
         """
+        cache_key = (query, max_results)
+        cached = _SEARCH_CACHE.get(cache_key)
+        if cached is not None:
+            logger.debug("검색 캐시 적중: %s", query)
+            return cached
+        
+        page = page or self.page
+        
         try:
             # 통합검색 URL: /searchTotal/result?st=KWRD&si=TOTAL&q=검색어
-            encoded_query = urllib.parse.quote(query)
+            encoded_query = _quote(query)
             search_url = f"{SEARCH_URL}?st=KWRD&si=TOTAL&q={encoded_query}"
             
-            print(f"[DEBUG] 검색 URL: {search_url}")
-            
-            await self.page.goto(search_url, wait_until="networkidle", timeout=30000)
-            await asyncio.sleep(2)  # 결과 로딩 대기
-            
-            print(f"[DEBUG] 현재 URL: {self.page.url}")
-            
-            # 검색 결과 수 확인
-            total_count = 0
-            try:
-                # 다양한 셀렉터 시도
-                count_selectors = [
-                    '.result-count', '.search-count', '.total-count',
-                    '.result_count', '#totalCount', '.resultCount',
-                    'span.count', '.search-result-count'
-                ]
-                for sel in count_selectors:
-                    count_elem = await self.page.query_selector(sel)
-                    if count_elem:
-                        count_text = await count_elem.text_content()
-                        count_match = re.search(r'(\d[\d,]*)', count_text.replace(',', ''))
-                        if count_match:
-                            total_count = int(count_match.group(1).replace(',', ''))
-                            print(f"[DEBUG] 검색 결과 수: {total_count} (selector: {sel})")
-                            break
-            except Exception as e:
-                print(f"[DEBUG] 결과 수 파싱 오류: {e}")
+            logger.debug("검색 URL: %s", search_url)
             
-            # 도서 목록 파싱
+            # HTTP로 먼저 조회하고, 결과가 없으면(JS 렌더링 등) 브라우저로 조회
             books = []
-            
-            # 다양한 도서 목록 셀렉터 시도
-            item_selectors = [
-                '.result-list li',
-                '.search-result-item',
-                '.book-item',
-                '.list-item',
-                'ul.list li',
-                '.resultList li',
-                '.search-list > li',
-                '.data-list li',
-                'div.result > ul > li',
-                '.searchResultList li',
-                'article.result',
-                '.book-list li'
-            ]
-            
-            book_items = []
-            used_selector = None
-            
-            for sel in item_selectors:
-                items = await self.page.query_selector_all(sel)
-                if items and len(items) > 0:
-                    book_items = items
-                    used_selector = sel
-                    print(f"[DEBUG] 도서 목록 발견: {len(items)}개 (selector: {sel})")
-                    break
-            
-            if not book_items:
-                # 페이지 HTML에서 도서 관련 링크 직접 탐색
-                print("[DEBUG] 기본 셀렉터로 찾지 못함. 링크로 탐색 시도...")
-                links = await self.page.query_selector_all('a[href*="/search/detail/"]')
-                print(f"[DEBUG] 상세보기 링크 발견: {len(links)}개")
-                
-                for link in links[:max_results]:
-                    try:
-                        href = await link.get_attribute('href')
-                        title_text = await link.text_content()
-                        
-                        if title_text and href:
-                            # Book ID 추출: /search/detail/CATTOT000000711410
-                            book_id = href.split('/detail/')[-1] if '/detail/' in href else ""
-                            
-                            # 부모 요소에서 추가 정보 추출 시도
-                            parent = await link.evaluate_handle('el => el.closest("li") || el.parentElement')
-                            author = ""
-                            publisher = ""
-                            status = "정보없음"
-                            
-                            if parent:
-                                parent_text = await parent.evaluate('el => el.innerText')
-                                # 간단한 파싱 (실제 구조에 맞게 조정 필요)
-                                lines = parent_text.split('\n')
-                                for line in lines:
-                                    if '저자' in line or '지음' in line:
-                                        author = line.strip()
-                                    if '출판' in line:
-                                        publisher = line.strip()
-                                    if '대출가능' in line:
-                                        status = "대출가능"
-                                    elif '대출중' in line:
-                                        status = "대출중"
-                            
-                            book = Book(
-                                title=title_text.strip(),
-                                author=author,
-                                publisher=publisher,
-                                year="",
-                                call_number="",
-                                location="",
-                                status=status,
-                                return_date="",
-                                book_id=book_id,
-                                detail_url=f"{BASE_URL}{href}" if not href.startswith('http') else href
-                            )
-                            books.append(book)
-                            print(f"[DEBUG] 도서 추가: {book.title[:30]}... (ID: {book_id})")
-                    except Exception as e:
-                        print(f"[DEBUG] 링크 파싱 오류: {e}")
-                        continue
-            else:
-                # 기존 셀렉터로 찾은 경우
-                for item in book_items[:max_results]:
-                    try:
-                        book = await self._parse_book_item(item)
-                        if book:
-                            books.append(book)
-                    except Exception as e:
-                        print(f"[DEBUG] 도서 파싱 오류: {e}")
-                        continue
-            
-            return SearchResult(
+            total_count = 0
+            html = await self._fetch_html(search_url)
+            if html is not None:
+                total_count, book_items = _parse_search_html(html, max_results)
+                books = [book for book in map(self._parse_book_item, book_items) if book]
+            if not books:
+                total_count, books = await self._search_book_browser(page, search_url, max_results)
+            
+            result = SearchResult(
                 query=query,
                 total_count=total_count if total_count > 0 else len(books),
                 books=books,
                 success=len(books) > 0,
                 message=f"{len(books)}건의 도서를 찾았습니다." if books else "검색 결과가 없습니다."
             )
+            if result.success:
+                _SEARCH_CACHE.set(cache_key, result)
+            return result
             
         except Exception as e:
-            print(f"[DEBUG] 검색 오류: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("검색 오류: %s", e)
             return SearchResult(
                 query=query,
                 total_count=0,
@@ -372,82 +939,150 @@ class BookCrawler:
                 message=f"검색 오류: {str(e)}"
             )
     
-    async def _parse_book_item(self, item) -> Optional[Book]:
-        """도서 항목 파싱"""
+    async def _search_book_browser(self, page: Page, search_url: str, max_results: int) -> tuple:
+        """
+        브라우저로 검색 결과 페이지 조회 및 파싱
+        
+        Returns:
+            (검색 결과 수, Book 목록)
+        """
+        await self._goto(search_url, SEARCH_READY_SELECTOR, page=page)
+        
+        logger.debug("현재 URL: %s", page.url)
+        
+        # 검색 결과 수 확인
+        total_count = 0
+        try:
+            # 셀렉터별 첫 요소 텍스트를 한 번에 조회 (없으면 None)
+            count_texts = await page.evaluate(_FIRST_TEXTS_JS, _COUNT_SELECTORS)
+            for sel, count_text in zip(_COUNT_SELECTORS, count_texts):
+                if count_text is not None:
+                    count_match = _RE_COUNT.search(count_text.replace(',', ''))
+                    if count_match:
+                        total_count = int(count_match.group(1).replace(',', ''))
+                        logger.debug("검색 결과 수: %s (selector: %s)", total_count, sel)
+                        break
+        except Exception as e:
+            logger.debug("결과 수 파싱 오류: %s", e)
+        
+        # 도서 목록 파싱
+        books = []
+        
+        # 첫 번째로 매칭되는 셀렉터의 항목들을 브라우저 안에서 바로 추출
+        found = await page.evaluate(_FIRST_ITEMS_JS, [_ITEM_SELECTORS, max_results, _BOOK_FIELD_SELECTORS])
+        book_items = found["items"] if found else []
+        if found:
+            logger.debug("도서 목록 발견: %s개 (selector: %s)", found['count'], found['selector'])
+        
+        if not book_items:
+            # 페이지 HTML에서 도서 관련 링크 직접 탐색
+            logger.debug("기본 셀렉터로 찾지 못함. 링크로 탐색 시도...")
+            # 링크마다 속성/텍스트/부모 텍스트를 따로 묻지 않고 한 번에 추출
+            links = await page.eval_on_selector_all('a[href*="/search/detail/"]', _DETAIL_LINKS_JS, max_results)
+            logger.debug("상세보기 링크 발견: %s개", len(links))
+            
+            for link in links:
+                try:
+                    href = link["href"]
+                    title_text = link["title"]
+                    
+                    if title_text and href:
+                        # Book ID 추출: /search/detail/CATTOT000000711410
+                        book_id = href.split('/detail/')[-1] if '/detail/' in href else ""
+                        
+                        # 부모 요소에서 추가 정보 추출 시도
+                        author = ""
+                        publisher = ""
+                        status = "정보없음"
+                        
+                        parent_text = link["parent_text"]
+                        if parent_text is not None:
+                            # 간단한 파싱 (실제 구조에 맞게 조정 필요)
+                            lines = parent_text.split('\n')
+                            for line in lines:
+                                # 한 번의 스캔으로 줄에 포함된 키워드 분류
+                                found = {m.group() for m in _RE_LINE_KEYWORD.finditer(line)}
+                                if not found:
+                                    continue
+                                if '저자' in found or '지음' in found:
+                                    author = line.strip()
+                                if '출판' in found:
+                                    publisher = line.strip()
+                                if '대출가능' in found:
+                                    status = "대출가능"
+                                elif '대출중' in found:
+                                    status = "대출중"
+                        
+                        book = Book(
+                            title=title_text.strip(),
+                            author=author,
+                            publisher=publisher,
+                            year="",
+                            call_number="",
+                            location="",
+                            status=status,
+                            return_date="",
+                            book_id=book_id,
+                            detail_url=f"{BASE_URL}{href}" if not href.startswith('http') else href
+                        )
+                        books.append(book)
+                        logger.debug("도서 추가: %s... (ID: %s)", book.title[:30], book_id)
+                except Exception as e:
+                    logger.debug("링크 파싱 오류: %s", e)
+                    continue
+        else:
+            # 기존 셀렉터로 찾은 경우
+            for item in book_items:
+                try:
+                    book = self._parse_book_item(item)
+                    if book:
+                        books.append(book)
+                except Exception as e:
+                    logger.debug("도서 파싱 오류: %s", e)
+                    continue
+        
+        return total_count, books
+    
+    def _parse_book_item(self, data: Dict[str, Any]) -> Optional[Book]:
+        """도서 항목 파싱 (_BOOK_ITEM_JS 추출 결과 → Book)"""
         try:
             # 제목
-            title = ""
-            title_elem = await item.query_selector('.title a, .book-title, td.title a, a.title')
-            if title_elem:
-                title = (await title_elem.text_content()).strip()
-            
+            title = data["title"]
             if not title:
                 return None
             
             # 상세 URL
             detail_url = ""
-            if title_elem:
-                href = await title_elem.get_attribute('href')
-                if href:
-                    detail_url = href if href.startswith('http') else f"{BASE_URL}{href}"
+            href = data["href"]
+            if href:
+                detail_url = href if href.startswith('http') else f"{BASE_URL}{href}"
             
             # Book ID 추출
             book_id = ""
             if detail_url:
-                id_match = re.search(r'recKey=(\d+)|id=(\d+)|book_id=(\d+)', detail_url)
+                id_match = _RE_BOOK_ID.search(detail_url)
                 if id_match:
                     book_id = id_match.group(1) or id_match.group(2) or id_match.group(3)
             
-            # 저자
-            author = ""
-            author_elem = await item.query_selector('.author, .book-author, td.author')
-            if author_elem:
-                author = (await author_elem.text_content()).strip()
-            
-            # 출판사
-            publisher = ""
-            pub_elem = await item.query_selector('.publisher, .book-publisher, td.publisher')
-            if pub_elem:
-                publisher = (await pub_elem.text_content()).strip()
-            
-            # 출판년도
-            year = ""
-            year_elem = await item.query_selector('.year, .pub-year, td.year')
-            if year_elem:
-                year = (await year_elem.text_content()).strip()
-            
-            # 청구기호
-            call_number = ""
-            call_elem = await item.query_selector('.call-number, .callno, td.callno')
-            if call_elem:
-                call_number = (await call_elem.text_content()).strip()
-            
-            # 소장위치
-            location = ""
-            loc_elem = await item.query_selector('.location, .lib-name, td.location')
-            if loc_elem:
-                location = (await loc_elem.text_content()).strip()
-            
             # 대출상태
             status = "정보없음"
             return_date = ""
-            status_elem = await item.query_selector('.status, .loan-status, td.status, .availability')
-            if status_elem:
-                status_text = (await status_elem.text_content()).strip()
+            status_text = data["status"]
+            if status_text is not None:
                 status = status_text
                 
                 # 반납예정일 추출
-                date_match = re.search(r'(\d{4}[-/.]\d{2}[-/.]\d{2}|\d{2}[-/.]\d{2})', status_text)
+                date_match = _RE_RETURN_DATE.search(status_text)
                 if date_match:
                     return_date = date_match.group(1)
             
             return Book(
                 title=title,
-                author=author,
-                publisher=publisher,
-                year=year,
-                call_number=call_number,
-                location=location,
+                author=data["author"],
+                publisher=data["publisher"],
+                year=data["year"],
+                call_number=data["call_number"],
+                location=data["location"],
                 status=status,
                 return_date=return_date,
                 book_id=book_id,
@@ -455,26 +1090,31 @@ class BookCrawler:
             )
             
         except Exception as e:
-            print(f"파싱 오류: {e}")
+            logger.debug("파싱 오류: %s", e)
             return None
     
-    async def get_book_detail(self, book_id: str) -> Dict[str, Any]:
+    async def get_book_detail(self, book_id: str, page: Optional[Page] = None) -> Dict[str, Any]:
         """
         도서 상세 정보 조회
         
         Args:
             book_id: 도서 ID (예: CATTOT000000711410)
+            page: 사용할 페이지 (None이면 크롤러 기본 페이지)
         
         Returns:
             도서 상세 정보
         """
+        cached = _DETAIL_CACHE.get(book_id)
+        if cached is not None:
+            logger.debug("상세 캐시 적중: %s", book_id)
+            return cached
+        
+        page = page or self.page
+        
         try:
             # 상세보기 URL: /search/detail/CATTOT000000711410
             detail_url = f"{DETAIL_URL}/{book_id}"
-            print(f"[DEBUG] 상세 URL: {detail_url}")
-            
-            await self.page.goto(detail_url, wait_until="networkidle", timeout=30000)
-            await asyncio.sleep(1)
+            logger.debug("상세 URL: %s", detail_url)
             
             # 상세 정보 파싱
             info = {
@@ -483,153 +1123,136 @@ class BookCrawler:
                 "success": True
             }
             
+            # HTTP로 받은 HTML에 소장 정보가 있으면 브라우저 없이 파싱
+            html = await self._fetch_html(detail_url)
+            if html is not None:
+                tree = HTMLParser(html)
+                holdings = _parse_holdings_html(tree)
+                if holdings:
+                    title = next((t.strip() for t in _first_texts(tree, _TITLE_SELECTORS) if t is not None), None)
+                    if title is not None:
+                        info["title"] = title
+                    info["holdings"] = holdings
+                    info["is_available"] = "대출가능" in html
+                    _DETAIL_CACHE.set(book_id, info)
+                    return info
+            
+            await self._goto(detail_url, DETAIL_READY_SELECTOR, page=page)
+            
+            # 제목 / 소장 정보 / 대출 가능 여부는 서로 독립적이므로 동시에 조회
+            # - 소장 정보: 셀렉터 우선순위 순으로 첫 결과를 한 번의 호출로 추출
+            # - 대출 가능 여부: 전체 HTML 전송 없이 브라우저에서 확인
+            title_texts, found, available_count = await asyncio.gather(
+                page.evaluate(_FIRST_TEXTS_JS, _TITLE_SELECTORS),
+                page.evaluate(_FIRST_HOLDINGS_JS, _TABLE_SELECTORS),
+                page.locator('text=대출가능').count()
+            )
+            
             # 제목
-            title_selectors = ['.book-title', '.detail-title', 'h1.title', 'h2.title', '.tit', '.book-name']
-            for sel in title_selectors:
-                title_elem = await self.page.query_selector(sel)
-                if title_elem:
-                    info["title"] = (await title_elem.text_content()).strip()
-                    break
-            
-            # 소장 정보 테이블 파싱
-            holdings = []
-            
-            # 테이블 행 찾기
-            table_selectors = [
-                '.holding-table tr',
-                '.location-table tbody tr', 
-                'table.holdings tr',
-                '.book-info table tr',
-                'table tr'
-            ]
+            title = next((t.strip() for t in title_texts if t is not None), None)
+            if title is not None:
+                info["title"] = title
             
-            for sel in table_selectors:
-                rows = await self.page.query_selector_all(sel)
-                if rows and len(rows) > 1:  # 헤더 제외
-                    for row in rows[1:]:  # 첫 행(헤더) 제외
-                        cols = await row.query_selector_all('td')
-                        if len(cols) >= 2:
-                            holding = {
-                                "location": (await cols[0].text_content()).strip() if len(cols) > 0 else "",
-                                "call_number": (await cols[1].text_content()).strip() if len(cols) > 1 else "",
-                                "status": (await cols[-1].text_content()).strip() if cols else ""
-                            }
-                            holdings.append(holding)
-                    if holdings:
-                        print(f"[DEBUG] 소장 정보 {len(holdings)}건 발견")
-                        break
+            # 소장 정보
+            holdings = found["holdings"] if found else []
+            if found:
+                logger.debug("소장 정보 %s건 발견 (selector: %s)", len(holdings), found["selector"])
             
             info["holdings"] = holdings
+            info["is_available"] = available_count > 0
             
-            # 대출 가능 여부
-            page_text = await self.page.content()
-            info["is_available"] = "대출가능" in page_text
-            
+            _DETAIL_CACHE.set(book_id, info)
             return info
             
         except Exception as e:
-            print(f"[DEBUG] 상세 정보 조회 오류: {e}")
+            logger.error("상세 정보 조회 오류: %s", e)
             return {
                 "book_id": book_id,
                 "success": False,
                 "message": f"상세 정보 조회 오류: {str(e)}"
             }
     
-    async def check_availability(self, book_id: str) -> Dict[str, Any]:
+    async def check_availability(self, book_id: str, page: Optional[Page] = None) -> Dict[str, Any]:
         """
         도서 대출 가능 여부 확인
         
         Args:
             book_id: 도서 ID
+            page: 사용할 페이지 (None이면 크롤러 기본 페이지)
         
         Returns:
             대출 가능 여부 정보
         """
+        cached = _AVAIL_CACHE.get(book_id)
+        if cached is not None:
+            logger.debug("대출 상태 캐시 적중: %s", book_id)
+            return cached
+        
+        page = page or self.page
+        
         try:
             detail_url = f"{DETAIL_URL}/{book_id}"
-            print(f"[DEBUG] 상세 URL: {detail_url}")
-            
-            await self.page.goto(detail_url, wait_until="networkidle", timeout=30000)
-            await asyncio.sleep(1)
+            logger.debug("상세 URL: %s", detail_url)
+            
+            # HTTP로 받은 HTML에서 먼저 확인하고, 대출 상태 행이 없으면(JS 렌더링 등) 브라우저로 조회
+            # (범례/필터/스크립트 속 "대출가능" 문자열만으로는 HTML 결과를 쓰지 않음 - get_book_detail의 holdings와 같은 기준)
+            page_content = None
+            title_texts = available_rows = unavailable_rows = None
+            html = await self._fetch_html(detail_url)
+            if html is not None:
+                tree = HTMLParser(html)
+                available_rows = _status_rows(tree, _AVAILABLE_STATUS_CANDIDATES)
+                unavailable_rows = _status_rows(tree, _UNAVAILABLE_STATUS_CANDIDATES)
+                if available_rows or unavailable_rows:
+                    title_texts = _first_texts(tree, _AVAIL_TITLE_SELECTORS)
+                    page_content = html
+            
+            if title_texts is None:
+                await self._goto(detail_url, DETAIL_READY_SELECTOR, page=page)
+                
+                # 제목 / 대출가능 / 대출중 요소는 서로 독립적이므로 동시에 조회
+                title_texts, available_rows, unavailable_rows = await asyncio.gather(
+                    page.evaluate(_FIRST_TEXTS_JS, _AVAIL_TITLE_SELECTORS),
+                    page.eval_on_selector_all(_AVAILABLE_STATUS_SELECTOR, _STATUS_ROWS_JS),
+                    page.eval_on_selector_all(_UNAVAILABLE_STATUS_SELECTOR, _STATUS_ROWS_JS)
+                )
             
-            # 제목 가져오기
-            title = ""
-            title_selectors = ['.book-title', '.detail-title', 'h1.title', 'h2.title', '.tit', '.book-name', '.titleArea']
-            for sel in title_selectors:
-                title_elem = await self.page.query_selector(sel)
-                if title_elem:
-                    title = (await title_elem.text_content()).strip()
-                    break
+            # 제목 가져오기 (셀렉터 우선순위 순으로 첫 매칭)
+            title = next((t.strip() for t in title_texts if t is not None), "")
             
             # 소장 정보에서 대출 상태 확인
             # <span class="status available">대출가능</span>
-            available_copies = []
-            unavailable_copies = []
-            
-            # 대출가능 상태 찾기
-            available_elems = await self.page.query_selector_all('span.status.available, span.available, .status:has-text("대출가능")')
-            print(f"[DEBUG] 대출가능 span 발견: {len(available_elems)}개")
-            
-            for elem in available_elems:
-                text = await elem.text_content()
-                if "대출가능" in text:
-                    # 부모 행에서 위치 정보 추출 시도
-                    parent_row = await elem.evaluate_handle('el => el.closest("tr") || el.closest("li") || el.parentElement')
-                    location = ""
-                    call_number = ""
-                    
-                    if parent_row:
-                        try:
-                            row_text = await parent_row.evaluate('el => el.innerText')
-                            location = row_text.split('\n')[0] if row_text else ""
-                        except:
-                            pass
-                    
-                    available_copies.append({
-                        "location": location.strip(),
-                        "call_number": call_number,
-                        "status": "대출가능"
-                    })
-            
-            # 대출중 상태 찾기
-            unavailable_elems = await self.page.query_selector_all('span.status.onloan, span.status.unavailable, .status:has-text("대출중")')
-            print(f"[DEBUG] 대출중 span 발견: {len(unavailable_elems)}개")
+            # 상태 요소 텍스트와 부모 행의 첫 줄(위치)을 한 번의 호출로 받음
+            logger.debug("대출가능 span 발견: %s개", len(available_rows))
+            available_copies = [
+                {"location": row["location"].strip(), "call_number": "", "status": "대출가능"}
+                for row in available_rows
+                if "대출가능" in row["text"]
+            ]
             
-            for elem in unavailable_elems:
-                text = await elem.text_content()
-                if "대출중" in text or "대출불가" in text:
-                    parent_row = await elem.evaluate_handle('el => el.closest("tr") || el.closest("li") || el.parentElement')
-                    location = ""
-                    
-                    if parent_row:
-                        try:
-                            row_text = await parent_row.evaluate('el => el.innerText')
-                            location = row_text.split('\n')[0] if row_text else ""
-                        except:
-                            pass
-                    
-                    unavailable_copies.append({
-                        "location": location.strip(),
-                        "call_number": "",
-                        "status": text.strip()
-                    })
+            logger.debug("대출중 span 발견: %s개", len(unavailable_rows))
+            unavailable_copies = [
+                {"location": row["location"].strip(), "call_number": "", "status": row["text"].strip()}
+                for row in unavailable_rows
+                if "대출중" in row["text"] or "대출불가" in row["text"]
+            ]
             
             total_count = len(available_copies) + len(unavailable_copies)
             
             # 만약 위 방법으로 못 찾았으면 페이지 텍스트에서 확인
             if total_count == 0:
-                page_content = await self.page.content()
+                if page_content is None:
+                    page_content = await page.content()
                 if "대출가능" in page_content:
                     # 대출가능 텍스트 개수 세기
-                    import re
-                    available_count = len(re.findall(r'대출가능', page_content))
+                    available_count = page_content.count('대출가능')
                     for _ in range(available_count):
                         available_copies.append({"location": "", "call_number": "", "status": "대출가능"})
-                    print(f"[DEBUG] 텍스트 검색으로 대출가능 {available_count}개 발견")
+                    logger.debug("텍스트 검색으로 대출가능 %s개 발견", available_count)
             
-            print(f"[DEBUG] 최종 - 대출가능: {len(available_copies)}개, 대출중: {len(unavailable_copies)}개")
+            logger.debug("최종 - 대출가능: %s개, 대출중: %s개", len(available_copies), len(unavailable_copies))
             
-            return {
+            result = {
                 "book_id": book_id,
                 "title": title,
                 "is_available": len(available_copies) > 0,
@@ -639,11 +1262,11 @@ class BookCrawler:
                 "unavailable_copies": unavailable_copies,
                 "success": True
             }
+            _AVAIL_CACHE.set(book_id, result)
+            return result
             
         except Exception as e:
-            print(f"[DEBUG] 대출 가능 확인 오류: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("대출 가능 확인 오류: %s", e)
             return {
                 "book_id": book_id,
                 "success": False,
@@ -668,40 +1291,29 @@ class BookCrawler:
                 "message": "로그인이 필요합니다. login() 메서드를 먼저 호출하세요."
             }
         
-        # 분관 코드 매핑
-        branch_codes = {
-            "농학도서관": "AL000000",
-            "법학도서관": "LL000000", 
-            "의학도서관": "ML000000"
-        }
-        
-        # 입력값 정규화
-        location_normalized = pickup_location.strip()
-        if location_normalized not in branch_codes:
-            # 부분 매칭 시도
-            for name in branch_codes.keys():
-                if location_normalized in name or name in location_normalized:
-                    location_normalized = name
-                    break
-            else:
-                return {
-                    "success": False,
-                    "message": f"지원하지 않는 분관입니다. 선택 가능: {', '.join(branch_codes.keys())}"
-                }
+        # 입력값 정규화 (별칭 → 분관명)
+        location_input = pickup_location.strip()
+        location_normalized = _BRANCH_ALIASES.get(location_input)
+        if location_normalized is None:
+            # "충남대 농학도서관"처럼 분관명을 포함한 입력
+            location_normalized = next((name for name in BRANCH_CODES if name in location_input), None)
+        if location_normalized is None:
+            return {
+                "success": False,
+                "message": f"지원하지 않는 분관입니다. 선택 가능: {', '.join(BRANCH_CODES.keys())}"
+            }
         
-        branch_code = branch_codes[location_normalized]
+        branch_code = BRANCH_CODES[location_normalized]
         
         try:
             # 도서 상세 페이지로 이동
             detail_url = f"{DETAIL_URL}/{book_id}"
-            print(f"[DEBUG] 상세 페이지 이동: {detail_url}")
+            logger.debug("상세 페이지 이동: %s", detail_url)
             
-            await self.page.goto(detail_url, wait_until="networkidle", timeout=30000)
-            await asyncio.sleep(2)
+            await self._goto(detail_url, BRANCH_READY_SELECTOR)
             
             # 대출 가능 여부 확인
-            page_content = await self.page.content()
-            if "대출가능" not in page_content:
+            if await self.page.locator('text=대출가능').count() == 0:
                 return {
                     "success": False,
                     "message": "현재 대출 가능한 도서가 없습니다."
@@ -709,11 +1321,11 @@ class BookCrawler:
             
             # 분관대출 링크 찾기
             # <a href="/search/branch/form?ctrl=...&accno=...&location=...&site_location=..." onclick="return doBranch(this)">
-            branch_link = await self.page.query_selector('a[href*="/search/branch/form"]')
+            branch_link = await self.page.query_selector(BRANCH_LINK_SELECTOR)
             
             if not branch_link:
                 # 대안: 이미지로 찾기
-                branch_link = await self.page.query_selector('a:has(img[alt*="분관대출"]), a:has(img[title*="분관대출"])')
+                branch_link = await self.page.query_selector(BRANCH_LINK_IMG_SELECTOR)
             
             if not branch_link:
                 return {
@@ -723,16 +1335,15 @@ class BookCrawler:
             
             # 분관대출 링크 URL 가져오기
             branch_href = await branch_link.get_attribute('href')
-            print(f"[DEBUG] 분관대출 링크 발견: {branch_href}")
+            logger.debug("분관대출 링크 발견: %s", branch_href)
             
             # 분관대출 신청 페이지로 이동
             branch_url = f"{BASE_URL}{branch_href}" if not branch_href.startswith('http') else branch_href
-            print(f"[DEBUG] 분관대출 신청 페이지 이동: {branch_url}")
+            logger.debug("분관대출 신청 페이지 이동: %s", branch_url)
             
-            await self.page.goto(branch_url, wait_until="networkidle", timeout=30000)
-            await asyncio.sleep(2)
+            await self._goto(branch_url, BRANCH_FORM_READY_SELECTOR)
             
-            print(f"[DEBUG] 현재 URL: {self.page.url}")
+            logger.debug("현재 URL: %s", self.page.url)
             
             # 분관 선택
             # <select id="receiveLoc" name="receiveLoc">
@@ -740,35 +1351,32 @@ class BookCrawler:
             
             if location_select:
                 await location_select.select_option(value=branch_code)
-                print(f"[DEBUG] 분관 선택: {location_normalized} ({branch_code})")
-                await asyncio.sleep(0.5)
+                logger.debug("분관 선택: %s (%s)", location_normalized, branch_code)
             else:
-                print(f"[DEBUG] 분관 선택 드롭다운을 찾을 수 없음")
-            
-            # 신청 버튼 클릭
-            submit_selectors = [
-                '#submitButton',
-                'a#submitButton',
-                'a[title="신청"]',
-                'button[type="submit"]',
-                'input[type="submit"]',
-                'button:has-text("신청")',
-                'a:has-text("신청")',
-                '.btn-submit',
-                '.submitBtn'
+                logger.debug("분관 선택 드롭다운을 찾을 수 없음")
+            
+            # 신청 버튼 클릭 (후보를 우선순위 순으로 한 번에 탐색)
+            submit_candidates = [
+                ('#submitButton', None),
+                ('a#submitButton', None),
+                ('a[title="신청"]', None),
+                ('button[type="submit"]', None),
+                ('input[type="submit"]', None),
+                ('button', '신청'),
+                ('a', '신청'),
+                ('.btn-submit', None),
+                ('.submitBtn', None)
             ]
             
             submitted = False
-            for sel in submit_selectors:
+            btn = await self._query_first(submit_candidates)
+            if btn:
                 try:
-                    btn = await self.page.query_selector(sel)
-                    if btn:
-                        await btn.click()
-                        submitted = True
-                        print(f"[DEBUG] 신청 버튼 클릭: {sel}")
-                        break
-                except:
-                    continue
+                    await btn.click()
+                    submitted = True
+                    logger.debug("신청 버튼 클릭")
+                except Exception as e:
+                    logger.debug("신청 버튼 클릭 실패: %s", e)
             
             if not submitted:
                 return {
@@ -784,7 +1392,7 @@ class BookCrawler:
             try:
                 dialog = await self.page.wait_for_event('dialog', timeout=3000)
                 dialog_message = dialog.message
-                print(f"[DEBUG] Alert 메시지: {dialog_message}")
+                logger.debug("Alert 메시지: %s", dialog_message)
                 await dialog.accept()
                 
                 if "완료" in dialog_message or "신청" in dialog_message or "성공" in dialog_message:
@@ -803,20 +1411,20 @@ class BookCrawler:
                 # alert 없음
                 pass
             
-            await self.page.wait_for_load_state("networkidle", timeout=10000)
+            # 전역 idle 대신 결과 표시 요소가 나타날 때까지 대기
+            try:
+                await self.page.wait_for_load_state("domcontentloaded", timeout=10000)
+                await self.page.wait_for_selector(PICKUP_RESULT_SELECTOR, timeout=5000)
+            except Exception as e:
+                logger.debug("신청 결과 요소 대기 실패: %s", e)
             
-            # 결과 페이지 확인
-            result_content = await self.page.content()
+            # 결과 페이지 확인 (전체 HTML을 받지 않고 브라우저에서 본문 텍스트로 성공/실패 키워드 확인)
+            is_success, is_error = await self.page.evaluate(
+                _TEXT_MATCHES_JS, [_RE_PICKUP_SUCCESS.pattern, _RE_PICKUP_ERROR.pattern]
+            )
             current_url = self.page.url
             
-            print(f"[DEBUG] 신청 후 URL: {current_url}")
-            
-            # 성공 여부 판단
-            success_keywords = ["완료", "성공", "신청되었습니다", "접수", "등록"]
-            error_keywords = ["실패", "오류", "에러", "불가", "없습니다", "권한"]
-            
-            is_success = any(kw in result_content for kw in success_keywords)
-            is_error = any(kw in result_content for kw in error_keywords)
+            logger.debug("신청 후 URL: %s", current_url)
             
             if is_success and not is_error:
                 return {
@@ -843,9 +1451,7 @@ class BookCrawler:
                 }
                 
         except Exception as e:
-            print(f"[DEBUG] 분관대출 신청 오류: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("분관대출 신청 오류: %s", e)
             return {
                 "success": False,
                 "message": f"분관대출 신청 오류: {str(e)}"
@@ -867,65 +1473,32 @@ class BookCrawler:
         try:
             # 분관대출 현황 페이지로 이동
             branch_loan_url = f"{BASE_URL}/myloan/branch"
-            print(f"[DEBUG] 분관대출 현황 페이지 이동: {branch_loan_url}")
+            logger.debug("분관대출 현황 페이지 이동: %s", branch_loan_url)
             
-            await self.page.goto(branch_loan_url, wait_until="networkidle", timeout=30000)
-            await asyncio.sleep(2)
+            await self._goto(branch_loan_url, _LOAN_ROW_SELECTOR, timeout=5000)
             
-            print(f"[DEBUG] 현재 URL: {self.page.url}")
+            logger.debug("현재 URL: %s", self.page.url)
             
             loans = []
             
-            # 테이블 행 찾기
-            row_selectors = [
-                'table tbody tr',
-                '.loan-list tr',
-                '.list-table tr',
-                '.dataTable tr',
-                'table.list tr'
-            ]
+            # 테이블 행 → (제목, 열 텍스트)를 브라우저 안에서 한 번에 추출
+            rows = await self.page.evaluate(_LOAN_ROWS_JS, _LOAN_ROW_SELECTOR)
+            logger.debug("분관대출 행 발견: %s개", len(rows))
             
-            for sel in row_selectors:
-                rows = await self.page.query_selector_all(sel)
-                if rows and len(rows) > 0:
-                    print(f"[DEBUG] 테이블 행 발견: {len(rows)}개 (selector: {sel})")
-                    
-                    for row in rows:
-                        cols = await row.query_selector_all('td')
-                        if len(cols) >= 2:
-                            # 각 열에서 텍스트 추출
-                            col_texts = []
-                            for col in cols:
-                                text = await col.text_content()
-                                col_texts.append(text.strip() if text else "")
-                            
-                            # 도서 제목 찾기 (링크가 있는 열)
-                            title = ""
-                            title_link = await row.query_selector('a[href*="/search/detail"]')
-                            if title_link:
-                                title = (await title_link.text_content()).strip()
-                            else:
-                                # 첫 번째 또는 두 번째 열이 제목일 가능성
-                                title = col_texts[0] if col_texts else ""
-                            
-                            if title and title != "":
-                                loan = {
-                                    "title": title,
-                                    "request_date": col_texts[1] if len(col_texts) > 1 else "",
-                                    "receive_location": col_texts[2] if len(col_texts) > 2 else "",
-                                    "status": col_texts[-1] if col_texts else "",
-                                    "raw_data": col_texts
-                                }
-                                loans.append(loan)
-                                print(f"[DEBUG] 분관대출 항목: {title[:30]}...")
-                    
-                    if loans:
-                        break
+            for row in rows:
+                col_texts = row["cols"]
+                loans.append({
+                    "title": row["title"],
+                    "request_date": col_texts[1] if len(col_texts) > 1 else "",
+                    "receive_location": col_texts[2] if len(col_texts) > 2 else "",
+                    "status": col_texts[-1],
+                    "raw_data": col_texts
+                })
             
             # 데이터가 없는 경우 페이지 텍스트 확인
             if not loans:
-                page_content = await self.page.content()
-                if "신청내역이 없습니다" in page_content or "데이터가 없습니다" in page_content:
+                (is_empty,) = await self.page.evaluate(_TEXT_MATCHES_JS, [_RE_NO_LOANS.pattern])
+                if is_empty:
                     return {
                         "success": True,
                         "count": 0,
@@ -941,9 +1514,7 @@ class BookCrawler:
             }
             
         except Exception as e:
-            print(f"[DEBUG] 분관대출 현황 조회 오류: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("분관대출 현황 조회 오류: %s", e)
             return {
                 "success": False,
                 "message": f"분관대출 현황 조회 오류: {str(e)}"
@@ -954,28 +1525,48 @@ class BookCrawler:
 # 동기 래퍼 함수들 (MCP Tool용)
 # ----------------------------
 _crawler_instance: Optional[BookCrawler] = None
+_crawler_lock = asyncio.Lock()
 
 
 async def _get_crawler() -> BookCrawler:
-    """크롤러 인스턴스 가져오기 (싱글톤)"""
+    """크롤러 인스턴스 가져오기 (싱글톤, 최초 초기화만 잠금)"""
     global _crawler_instance
     if _crawler_instance is None:
-        _crawler_instance = BookCrawler(headless=True)
-        await _crawler_instance.start()
+        async with _crawler_lock:
+            if _crawler_instance is None:
+                crawler = BookCrawler(headless=True)
+                await crawler.start()
+                _crawler_instance = crawler
     return _crawler_instance
 
 
+async def warmup():
+    """서버 기동 시 브라우저/컨텍스트 풀 미리 준비 (첫 요청 지연 제거)"""
+    try:
+        await _get_crawler()
+        logger.debug("크롤러 웜업 완료")
+    except Exception as e:
+        logger.error("크롤러 웜업 실패: %s", e)
+
+
 async def search_book_async(query: str, max_results: int = 10) -> Dict[str, Any]:
-    """도서 검색 (async)"""
+    """도서 검색 (async, 요청별 페이지에서 동시 실행)"""
+    # 캐시 적중이면 페이지 풀을 거치지 않고 바로 반환 (반복 질의)
+    cached = _SEARCH_CACHE.get((query, max_results))
+    if cached is not None:
+        logger.debug("검색 캐시 적중: %s", query)
+        return cached.to_dict()
     crawler = await _get_crawler()
-    result = await crawler.search_book(query, max_results)
+    async with crawler.acquire_page() as (ctx, page):
+        result = await crawler.search_book(query, max_results, page=page)
     return result.to_dict()
 
 
 async def check_book_availability_async(book_id: str) -> Dict[str, Any]:
-    """대출 가능 여부 확인 (async)"""
+    """대출 가능 여부 확인 (async, 요청별 페이지에서 동시 실행)"""
     crawler = await _get_crawler()
-    return await crawler.check_availability(book_id)
+    async with crawler.acquire_page() as (ctx, page):
+        return await crawler.check_availability(book_id, page=page)
 
 
 async def login_async(user_id: str, password: str) -> Dict[str, Any]:
@@ -1001,6 +1592,8 @@ async def get_my_loans_async() -> Dict[str, Any]:
 # ----------------------------
 async def main():
     """CLI 테스트"""
+    logging.basicConfig(level=logging.DEBUG, format="[%(levelname)s] %(message)s")
+    
     print("=" * 60)
     print("CNU Library Book Crawler - Test")
     print("=" * 60)
@@ -1051,6 +1644,9 @@ async def main():
                 print(f"\n분관대출 현황: {result.get('count', 0)}건")
                 for loan in result.get("loans", []):
                     print(f"  - {loan.get('title', '')[:30]} | 수령처: {loan.get('receive_location', '')} | 상태: {loan.get('status', '')}")
+    
+    await CONTEXT_POOL.close()
+    await POOL.close()
 
 
 if __name__ == "__main__":
@@ -10,10 +10,18 @@ LLM 기반 브라우저 자동화 에이전트
 """
 
 import asyncio
+import copy
+import functools
+import hashlib
+import inspect
+import itertools
 import json
-import re
+import math
 import os
+import re
 import sys
+import urllib.parse
+from collections import Counter, OrderedDict, deque
 from typing import Dict, Any, List, Optional, Callable
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
@@ -59,6 +67,266 @@ def init_langfuse():
         return None
 
 
+# 액션 선택 시스템 프롬프트 (매 단계 동일 → LLM 제공자 프롬프트 캐시 적중)
+# 목표/페이지 상태/히스토리는 user 메시지로 따로 전달
+_SYSTEM_PROMPT = """당신은 브라우저 자동화 에이전트입니다.
+
+## 절대 규칙
+1. 목표를 정확히 파악하세요! 검색만 요청하면 검색만, 로그인 요청하면 로그인만!
+2. 이전 히스토리에서 이미 성공한 액션은 다시 하지 마세요!
+3. 같은 셀렉터에 같은 액션을 반복하지 마세요!
+
+## 목표별 행동 가이드
+
+### 검색 요청인 경우 (예: "자바의 정석 검색해줘")
+1단계: 팝업 닫기 (a.infoClose) - 있으면
+2단계: 검색창에 검색어 입력 (input[name='q'])
+3단계: 검색 버튼 클릭 (input.searchBtn) 또는 Enter
+4단계: 검색 결과 확인 후 done
+※ 로그인 불필요! 검색은 로그인 없이 가능!
+
+### 로그인 요청인 경우 (예: "로그인해줘", 아이디/비밀번호 포함)
+1단계: 팝업 닫기 (a.infoClose) - 있으면
+2단계: 로그인 페이지로 이동 - 필요시
+3단계: 학번/아이디 입력 (input#id, input[name='user_id'], input[name='id'] 등)
+4단계: 비밀번호 입력 (input[name='password'], input[name='user_password'] 등)
+5단계: 로그인 버튼 클릭 (button[type='submit'], input[type='submit'], .login-btn 등) 또는 Enter
+6단계: 페이지 URL이 변경되었거나 "로그아웃" 텍스트가 보이면 done
+※ Enter 후에도 로그인 페이지면 → 로그인 버튼 직접 클릭 시도!
+※ 로그인 성공 확인: URL 변경, "로그아웃", "마이페이지", 사용자 이름 등
+
+### 층별 안내 요청인 경우 (예: "3층에 뭐 있어?", "열람실 어디야?", "북카페 위치", "운영시간")
+1단계: 시설 안내 페이지로 이동 (https://library.cnu.ac.kr/webcontent/info/326)
+2단계: 페이지 내용에서 해당 시설/층 정보 찾기
+3단계: 찾은 정보를 done으로 응답
+※ 시설 안내 페이지 URL: https://library.cnu.ac.kr/webcontent/info/326
+
+### 대출/예약 요청인 경우
+- 로그인 필요 → 로그인 먼저 → 해당 작업 수행
+
+## 충남대 도서관 사이트 정보
+- 검색창: input[name='q']
+- 검색버튼: input.searchBtn
+- 로그인 폼: input#id (학번), input[name='password'] (비밀번호)
+- 팝업 닫기: a.infoClose
+- 시설안내 페이지: https://library.cnu.ac.kr/webcontent/info/326
+
+## 사용 가능한 액션
+- click: 요소 클릭 {"action": "click", "selector": "CSS셀렉터"}
+- type: 텍스트 입력 {"action": "type", "selector": "CSS셀렉터", "value": "입력할텍스트"}
+- press_key: 키 입력 {"action": "press_key", "value": "Enter"}
+- done: 작업 완료 {"action": "done", "value": "결과요약"}
+- navigate: 페이지 이동 {"action": "navigate", "value": "URL"}
+
+## 지시사항
+1. 목표를 먼저 파악하세요! "검색"이면 검색만, "로그인"이면 로그인만, "층별/위치/운영시간"이면 시설안내 페이지!
+2. 층별 안내/시설 위치/운영시간 질문이면: https://library.cnu.ac.kr/webcontent/info/326 로 이동 → 정보 확인 → done
+3. 검색 요청이면: 검색창(input[name='q'])에 입력 → 검색버튼 또는 Enter → done
+4. 로그인 요청이면: ID입력 → PW입력 → 로그인 버튼 클릭 → URL 변경 확인 → done
+5. Enter 눌렀는데 아직 로그인 페이지면 → 로그인 버튼(button, input[type='submit']) 클릭!
+6. 이미 한 액션은 반복하지 마세요!
+
+## 응답 형식 (JSON만 출력)
+{"action": "액션명", "selector": "셀렉터(필요시)", "value": "값(필요시)", "reason": "이 액션을 선택한 이유"}
+"""
+
+
+def _scrub_surrogates(text: str) -> str:
+    """짝 없는 surrogate 문자 치환 (없으면 원본 그대로 반환, 검사는 C 구현 인코더에 맡김)"""
+    if text.isascii():
+        return text
+    try:
+        text.encode('utf-8')
+        return text
+    except UnicodeEncodeError:
+        return text.encode('utf-8', errors='replace').decode('utf-8')
+
+
+def _extract_json_object(text: str) -> Optional[str]:
+    """응답에서 첫 번째 JSON 객체 문자열 추출 (중괄호 균형 검사, 문자열 내부 중괄호 무시)"""
+    start = text.find('{')
+    if start < 0:
+        return None
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        c = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif c == '\\':
+                escaped = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+def _accepts_system_kwarg(callback: Optional[Callable]) -> bool:
+    """콜백이 system 키워드 인자를 받는지 (기존 1인자 콜백 호환용)"""
+    if callback is None:
+        return False
+    try:
+        params = inspect.signature(callback).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(p.name == "system" or p.kind == inspect.Parameter.VAR_KEYWORD for p in params)
+
+
+def _snapshot_vector(text: str, dims: int = 4096) -> Dict[int, float]:
+    """스냅샷 텍스트의 해시 문자 3-gram 벡터 (L2 정규화, 희소 dict)"""
+    counts = Counter(hash(text[i:i + 3]) % dims for i in range(len(text) - 2))
+    norm = math.sqrt(sum(c * c for c in counts.values())) or 1.0
+    return {k: c / norm for k, c in counts.items()}
+
+
+def _cosine(a: Dict[int, float], b: Dict[int, float]) -> float:
+    """정규화된 희소 벡터 코사인 유사도"""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(k, 0.0) for k, v in a.items())
+
+
+# ----------------------------
+# 규칙 기반 빠른 경로 (정형화된 단계는 LLM 없이 바로 액션 결정)
+# ----------------------------
+_RE_QUOTED_QUERY = re.compile(r"['\"‘’“”]([^'\"‘’“”]+)['\"‘’“”]")
+# 자격 증명은 "키: 값" / "키=값" 형태만 인식 (자연어 문장에서 잘못 뽑은 값을 입력하면 계정 잠김 위험)
+# 키는 단어 경계 기준 (예: 'video' 안의 'id'는 무시), 따옴표로 감싼 값은 공백/구두점 포함 그대로 사용
+_RE_LOGIN_ID = re.compile(r'\b(?:아이디|학번|id)\s*[:=]\s*(?:"([^"]*)"|\'([^\']*)\'|(\S+))', re.IGNORECASE)
+_RE_LOGIN_PW = re.compile(r'\b(?:비밀번호|비번|pw|password)\s*[:=]\s*(?:"([^"]*)"|\'([^\']*)\'|(\S+))', re.IGNORECASE)
+# 따옴표 없는 값이 조사/문장부호로 끝나거나 한글/따옴표를 포함하면 값의 끝을 알 수 없음 (잘라내지 않고 LLM에 맡김)
+_RE_AMBIGUOUS_VALUE = re.compile(r'[가-힣\'"‘’“”]|[.,;:!?)\]}]$')
+
+
+def _attempted(history, action: str, selector: str = None) -> bool:
+    """같은 액션(셀렉터)을 이미 시도했는지 (성공/실패 무관, 규칙 반복 방지)"""
+    return any(
+        r.action.get('action') == action and (selector is None or r.action.get('selector') == selector)
+        for r in history
+    )
+
+
+def _has_selector(snapshot_text: str, selector: str) -> bool:
+    return f"selector: {selector}" in snapshot_text
+
+
+def _search_query(goal: str) -> Optional[str]:
+    """검색 목표에서 따옴표로 감싼 검색어 추출"""
+    if "검색" not in goal:
+        return None
+    match = _RE_QUOTED_QUERY.search(goal)
+    return match.group(1).strip() if match else None
+
+
+def _credential_value(pattern: re.Pattern, goal: str) -> Optional[str]:
+    """키에 주어진 값 (값을 그대로 확정할 수 없거나 키가 서로 다른 값으로 여러 번 나오면 None)"""
+    values = set()
+    for match in pattern.finditer(goal):
+        double_quoted, single_quoted, bare = match.groups()
+        if bare is not None and _RE_AMBIGUOUS_VALUE.search(bare):
+            return None
+        values.add(bare if bare is not None else double_quoted if double_quoted is not None else single_quoted)
+    if len(values) != 1:
+        return None
+    return values.pop() or None
+
+
+def _credentials(goal: str) -> Optional[tuple]:
+    """목표에서 (아이디, 비밀번호) 추출 (둘 다 명시적으로 주어진 경우만)"""
+    user_id = _credential_value(_RE_LOGIN_ID, goal)
+    password = _credential_value(_RE_LOGIN_PW, goal)
+    return (user_id, password) if user_id and password else None
+
+
+def _just_typed(history, selector: str) -> bool:
+    """직전 단계가 해당 셀렉터에 성공한 입력인지 (Enter 규칙을 입력 바로 다음에만 적용)"""
+    if not history:
+        return False
+    last = history[-1]
+    return last.success and last.action.get('action') == 'type' and last.action.get('selector') == selector
+
+
+# (조건, 액션 생성) 목록 - 위에서부터 처음 조건을 만족하는 규칙 사용
+# 인자: (목표, 스냅샷 텍스트, 히스토리)
+_FAST_RULES = [
+    # 안내 팝업 닫기
+    (lambda goal, text, history: _has_selector(text, "a.infoClose") and not _attempted(history, "click", "a.infoClose"),
+     lambda goal, text, history: {"action": "click", "selector": "a.infoClose", "reason": "안내 팝업 닫기 (규칙)"}),
+    # 검색어 입력
+    (lambda goal, text, history: _search_query(goal) is not None and _has_selector(text, "input[name='q']")
+        and not _attempted(history, "type", "input[name='q']"),
+     lambda goal, text, history: {"action": "type", "selector": "input[name='q']", "value": _search_query(goal),
+                                  "reason": "검색창에 검색어 입력 (규칙)"}),
+    # 검색 실행
+    (lambda goal, text, history: _search_query(goal) is not None and _just_typed(history, "input[name='q']"),
+     lambda goal, text, history: {"action": "press_key", "value": "Enter", "reason": "검색 실행 (규칙)"}),
+    # 로그인 아이디 입력
+    (lambda goal, text, history: _credentials(goal) is not None and _has_selector(text, "#id")
+        and not _attempted(history, "type", "input#id"),
+     lambda goal, text, history: {"action": "type", "selector": "input#id", "value": _credentials(goal)[0],
+                                  "reason": "로그인 아이디 입력 (규칙)"}),
+    # 로그인 비밀번호 입력
+    (lambda goal, text, history: _credentials(goal) is not None and _attempted(history, "type", "input#id")
+        and _has_selector(text, "input[name='password']") and not _attempted(history, "type", "input[name='password']"),
+     lambda goal, text, history: {"action": "type", "selector": "input[name='password']", "value": _credentials(goal)[1],
+                                  "reason": "로그인 비밀번호 입력 (규칙)"}),
+    # 로그인 실행
+    (lambda goal, text, history: _credentials(goal) is not None and _just_typed(history, "input[name='password']"),
+     lambda goal, text, history: {"action": "press_key", "value": "Enter", "reason": "로그인 실행 (규칙)"}),
+]
+
+
+# ----------------------------
+# 링크 프리페치 (다음 navigate/click이 브라우저 HTTP 캐시를 타도록 LLM 응답을 기다리는 동안 미리 요청)
+# ----------------------------
+# 읽기 전용으로 알려진 경로만 요청 (검색 결과 / 도서 상세) - 상태를 바꾸는 링크는 절대 요청하지 않음
+_PREFETCH_LINK_SELECTOR = 'a[href*="/search/detail/"], a[href*="/searchTotal/result"]'
+_PREFETCH_PATH_RE = re.compile(r"^/(?:search/detail/[^/]+|searchTotal/result)$")
+
+# 보이는(클릭 가능한) 링크의 절대 URL
+_PREFETCH_LINKS_JS = """links => links
+    .filter(a => { const r = a.getBoundingClientRect(); return r.width > 0 && r.height > 0; })
+    .map(a => a.href)"""
+
+# <link rel=prefetch> 추가 (APIRequestContext 요청과 달리 페이지의 HTTP 캐시에 저장됨)
+_PREFETCH_HINTS_JS = """urls => {
+    const head = document.head || document.documentElement;
+    for (const url of urls) {
+        const link = document.createElement('link');
+        link.rel = 'prefetch';
+        link.href = url;
+        head.appendChild(link);
+    }
+}"""
+
+
+def _prefetch_candidates(hrefs: List[str], current_url: str, seen: set, limit: int) -> List[str]:
+    """프리페치할 URL (같은 도메인 + 읽기 전용 경로, 중복/현재 페이지 제외, 문서 순서 앞쪽 limit개)"""
+    origin = urllib.parse.urlsplit(current_url)
+    here = current_url.split('#', 1)[0]
+    picked = []
+    for href in hrefs:
+        url = href.split('#', 1)[0]
+        parts = urllib.parse.urlsplit(url)
+        if (parts.scheme, parts.netloc) != (origin.scheme, origin.netloc):
+            continue
+        if url == here or url in seen or url in picked or not _PREFETCH_PATH_RE.match(parts.path):
+            continue
+        picked.append(url)
+        if len(picked) >= limit:
+            break
+    return picked
+
+
 @dataclass
 class AgentConfig:
     """에이전트 설정"""
@@ -70,6 +338,11 @@ class AgentConfig:
     viewport_height: int = 900
     locale: str = "ko-KR"
     llm_provider: str = "anthropic"        # anthropic, openai, local
+    semantic_cache: bool = False           # True면 유사 스냅샷(같은 URL/히스토리)의 액션 재사용
+    semantic_cache_threshold: float = 0.95 # 유사 스냅샷 액션 재사용 기준 (코사인 유사도)
+    structured_snapshot: bool = False      # True면 PageSnapshot 경유 (디버그용, 기본은 브라우저에서 텍스트 생성)
+    viewport_only_snapshot: bool = False   # True면 현재 화면 안의 요소만 스냅샷에 포함
+    prefetch_links: int = 0                # 페이지마다 미리 요청할 결과/상세 링크 수 (0이면 비활성화)
 
 
 @dataclass
@@ -80,6 +353,7 @@ class StepRecord:
     action: Dict[str, Any]
     observation: str
     success: bool
+    cache_hits: int = 0                    # 이 단계까지 LLM 캐시 적중 횟수
     timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
 
 
@@ -101,9 +375,11 @@ class BrowserUseAgent:
         Args:
             config: 에이전트 설정
             llm_callback: LLM 호출 함수 (prompt: str) -> str
+                          system 키워드를 받으면 고정 지시사항을 따로 전달, 아니면 프롬프트 앞에 붙여 전달
         """
         self.config = config or AgentConfig()
         self.llm_callback = llm_callback
+        self._llm_accepts_system = _accepts_system_kwarg(llm_callback)
         
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
@@ -111,7 +387,10 @@ class BrowserUseAgent:
         self.tools: Optional[BrowserTools] = None
         self.snapshot_extractor: Optional[SnapshotExtractor] = None
         
-        self.step_history: List[StepRecord] = []
+        # 최대 단계 수만큼만 보관하는 링 버퍼
+        self.step_history: "deque[StepRecord]" = deque(maxlen=self.config.max_steps)
+        # 최근 성공 액션 (wait 제외) - Post-summary용
+        self._success_tail: "deque[StepRecord]" = deque(maxlen=16)
         self.page_summaries: List[PageSummary] = []
         self.current_goal: str = ""
         self.is_running: bool = False
@@ -119,6 +398,23 @@ class BrowserUseAgent:
         # Langfuse 추적
         self.current_trace = None
         self.langfuse = None
+        
+        # 액션 선택 캐시 (프롬프트 해시 → 액션, LRU)
+        self._llm_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._llm_cache_size = 128
+        self._last_cache_key: Optional[str] = None
+        self.cache_hits = 0
+        # 유사 스냅샷 캐시 (타임스탬프/광고만 다른 페이지) - 현재 목표 기준, [(벡터, 캐시키, 액션, (URL, 히스토리))]
+        self._semantic_cache: deque = deque(maxlen=64)
+        
+        # 직전 스냅샷 텍스트 (재시도 시 변환 생략)
+        self._last_snapshot_sig: Optional[tuple] = None
+        self._last_snapshot_text: str = ""
+        
+        # 링크 프리페치 (페이지당 1회, fire-and-forget 태스크 참조 보관)
+        self._prefetched_url: str = ""
+        self._prefetched_links: set = set()
+        self._prefetch_task: Optional[asyncio.Task] = None
     
     async def initialize(self):
         """브라우저 초기화"""
@@ -140,7 +436,7 @@ class BrowserUseAgent:
         
         self.page = await self.context.new_page()
         self.tools = BrowserTools(self.page)
-        self.snapshot_extractor = SnapshotExtractor(self.page)
+        self.snapshot_extractor = SnapshotExtractor(self.page, viewport_only=self.config.viewport_only_snapshot)
         
         print("[Agent] Browser initialized", file=sys.stderr)
     
@@ -148,6 +444,13 @@ class BrowserUseAgent:
         """브라우저 종료"""
         import sys
         
+        if self._prefetch_task and not self._prefetch_task.done():
+            self._prefetch_task.cancel()
+            try:
+                await self._prefetch_task
+            except asyncio.CancelledError:
+                pass
+        
         if self.browser:
             await self.browser.close()
             print("[Agent] Browser closed", file=sys.stderr)
@@ -167,9 +470,12 @@ class BrowserUseAgent:
             await self.initialize()
         
         # 인코딩 문제 해결
-        goal_clean = goal.encode('utf-8', errors='replace').decode('utf-8')
+        goal_clean = _scrub_surrogates(goal)
+        if goal_clean != self.current_goal:
+            self._semantic_cache.clear()
         self.current_goal = goal_clean
-        self.step_history = []
+        self.step_history = deque(maxlen=self.config.max_steps)
+        self._success_tail.clear()
         self.is_running = True
         
         print(f"[Agent] Goal: {goal_clean}", file=sys.stderr)
@@ -200,23 +506,13 @@ class BrowserUseAgent:
                 await asyncio.sleep(2)
             
             # Pre-analysis: 페이지 스냅샷 (재시도 로직 추가)
-            snapshot = None
-            for retry in range(3):
-                try:
-                    await self.page.wait_for_load_state("domcontentloaded", timeout=10000)
-                    snapshot = await self.snapshot_extractor.extract()
-                    break
-                except Exception as e:
-                    print(f"[Agent] Snapshot retry {retry+1}/3: {e}", file=sys.stderr)
-                    await asyncio.sleep(1)
-            
-            if not snapshot:
+            snapshot_text = await self._snapshot_text()
+            if snapshot_text is None:
                 print("[Agent] Snapshot failed after retries", file=sys.stderr)
                 break
             
-            snapshot_text = snapshot_to_text(snapshot)
-            
-            print(f"[Agent] Snapshot: {snapshot.page_type}, {len(snapshot.elements)} elements", file=sys.stderr)
+            # LLM 응답을 기다리는 동안 다음 페이지 후보 링크 프리페치
+            self._schedule_prefetch()
             
             # LLM에게 다음 액션 질의
             action_dict = await self._select_action(snapshot_text, step)
@@ -240,9 +536,12 @@ class BrowserUseAgent:
                 thought=action_dict.get('reason', ''),
                 action=action_dict,
                 observation=result.message,
-                success=result.success
+                success=result.success,
+                cache_hits=self.cache_hits
             )
             self.step_history.append(record)
+            if record.success and action_dict.get('action') != 'wait':
+                self._success_tail.append(record)
             
             # 완료 확인
             if action.action_type == ActionType.DONE:
@@ -250,8 +549,9 @@ class BrowserUseAgent:
                 self.is_running = False
                 break
             
-            # 실패 시 Reflection
+            # 실패 시 Reflection (실패한 액션은 캐시에서 제거해 같은 상태에서 다시 질의)
             if not result.success:
+                self._forget_cached_action(self._last_cache_key)
                 reflection = await self._reflect_on_failure(action_dict, result)
                 print(f"[Agent] Reflection: {reflection}", file=sys.stderr)
             
@@ -275,13 +575,81 @@ class BrowserUseAgent:
         
         return result
     
+    async def _snapshot_text(self) -> Optional[str]:
+        """
+        현재 페이지 스냅샷 텍스트 (최대 3회 재시도, 실패 시 None)
+        기본은 브라우저에서 바로 텍스트 생성, structured_snapshot 설정 시 PageSnapshot 경유 (디버그용)
+        """
+        for retry in range(3):
+            try:
+                await self.page.wait_for_load_state("domcontentloaded", timeout=10000)
+                if not self.config.structured_snapshot:
+                    snapshot_text = await self.snapshot_extractor.extract_text()
+                    print(f"[Agent] Snapshot: {self.snapshot_extractor.last_page_type}, "
+                          f"{self.snapshot_extractor.last_element_count} elements", file=sys.stderr)
+                    return snapshot_text
+                
+                snapshot = await self.snapshot_extractor.extract()
+                print(f"[Agent] Snapshot: {snapshot.page_type}, {len(snapshot.elements)} elements", file=sys.stderr)
+                
+                # 페이지 상태가 직전 스냅샷과 같으면 텍스트 변환 결과 재사용
+                snapshot_sig = self._snapshot_signature(snapshot)
+                if snapshot_sig != self._last_snapshot_sig:
+                    self._last_snapshot_sig = snapshot_sig
+                    self._last_snapshot_text = snapshot_to_text(snapshot)
+                return self._last_snapshot_text
+            except Exception as e:
+                print(f"[Agent] Snapshot retry {retry+1}/3: {e}", file=sys.stderr)
+                await asyncio.sleep(1)
+        return None
+    
+    def _schedule_prefetch(self):
+        """현재 페이지의 링크 프리페치를 백그라운드로 예약 (선택, 페이지당 1회, 이전 작업이 끝나지 않았으면 생략)"""
+        if self.config.prefetch_links <= 0:
+            return
+        url = self.page.url
+        if url == self._prefetched_url or (self._prefetch_task and not self._prefetch_task.done()):
+            return
+        self._prefetched_url = url
+        self._prefetch_task = asyncio.create_task(self._prefetch_links())
+    
+    async def _prefetch_links(self):
+        """보이는 결과/상세 링크를 <link rel=prefetch>로 미리 요청 (실패해도 무시)"""
+        try:
+            hrefs = await self.page.eval_on_selector_all(_PREFETCH_LINK_SELECTOR, _PREFETCH_LINKS_JS)
+            urls = _prefetch_candidates(hrefs, self.page.url, self._prefetched_links, self.config.prefetch_links)
+            if not urls:
+                return
+            self._prefetched_links.update(urls)
+            await self.page.evaluate(_PREFETCH_HINTS_JS, urls)
+            print(f"[Agent] Prefetching {len(urls)} links", file=sys.stderr)
+        except Exception as e:
+            print(f"[Agent] Prefetch skipped: {e}", file=sys.stderr)
+    
+    @staticmethod
+    def _snapshot_signature(snapshot: PageSnapshot) -> tuple:
+        """스냅샷 비교용 시그니처 (URL/유형/전체 요소 수/모든 요소의 셀렉터·텍스트/폼 수/본문)"""
+        elements = hash(tuple((e.selector, e.text) for e in snapshot.elements))
+        return (
+            snapshot.url, snapshot.title, snapshot.page_type,
+            snapshot.element_count, elements, len(snapshot.forms), hash(snapshot.page_text)
+        )
+    
     async def _select_action(self, snapshot_text: str, step: int) -> Optional[Dict[str, Any]]:
-        """LLM에게 다음 액션 질의"""
+        """LLM에게 다음 액션 질의 (같은 프롬프트면 캐시된 액션 재사용)"""
+        
+        # 정형화된 단계는 규칙으로 바로 결정
+        for predicate, build_action in _FAST_RULES:
+            if predicate(self.current_goal, snapshot_text, self.step_history):
+                self._last_cache_key = None
+                action_dict = build_action(self.current_goal, snapshot_text, self.step_history)
+                print(f"[Agent] Rule fast path: {action_dict['action']}", file=sys.stderr)
+                return action_dict
         
         # 이전 액션 히스토리
         history_text = ""
         if self.step_history:
-            recent = self.step_history[-5:]  # 최근 5개
+            recent = itertools.islice(self.step_history, max(0, len(self.step_history) - 5), None)  # 최근 5개
             history_lines = []
             for r in recent:
                 history_lines.append(f"Step {r.step}: {r.action.get('action')} -> {r.observation}")
@@ -297,9 +665,7 @@ class BrowserUseAgent:
 - 완료한 작업: {', '.join(recent_summary.completed_actions[:3])}
 """
         
-        prompt = f"""당신은 브라우저 자동화 에이전트입니다.
-
-## 목표
+        prompt = f"""## 목표
 {self.current_goal}
 
 ## 현재 페이지 상태
@@ -309,79 +675,59 @@ class BrowserUseAgent:
 {history_text if history_text else "없음"}
 
 {context_text}
-
-## 절대 규칙
-1. 목표를 정확히 파악하세요! 검색만 요청하면 검색만, 로그인 요청하면 로그인만!
-2. 이전 히스토리에서 이미 성공한 액션은 다시 하지 마세요!
-3. 같은 셀렉터에 같은 액션을 반복하지 마세요!
-
-## 목표별 행동 가이드
-
-### 검색 요청인 경우 (예: "자바의 정석 검색해줘")
-1단계: 팝업 닫기 (a.infoClose) - 있으면
-2단계: 검색창에 검색어 입력 (input[name='q'])
-3단계: 검색 버튼 클릭 (input.searchBtn) 또는 Enter
-4단계: 검색 결과 확인 후 done
-※ 로그인 불필요! 검색은 로그인 없이 가능!
-
-### 로그인 요청인 경우 (예: "로그인해줘", 아이디/비밀번호 포함)
-1단계: 팝업 닫기 (a.infoClose) - 있으면
-2단계: 로그인 페이지로 이동 - 필요시
-3단계: 학번/아이디 입력 (input#id, input[name='user_id'], input[name='id'] 등)
-4단계: 비밀번호 입력 (input[name='password'], input[name='user_password'] 등)
-5단계: 로그인 버튼 클릭 (button[type='submit'], input[type='submit'], .login-btn 등) 또는 Enter
-6단계: 페이지 URL이 변경되었거나 "로그아웃" 텍스트가 보이면 done
-※ Enter 후에도 로그인 페이지면 → 로그인 버튼 직접 클릭 시도!
-※ 로그인 성공 확인: URL 변경, "로그아웃", "마이페이지", 사용자 이름 등
-
-### 층별 안내 요청인 경우 (예: "3층에 뭐 있어?", "열람실 어디야?", "북카페 위치", "운영시간")
-1단계: 시설 안내 페이지로 이동 (https://library.cnu.ac.kr/webcontent/info/326)
-2단계: 페이지 내용에서 해당 시설/층 정보 찾기
-3단계: 찾은 정보를 done으로 응답
-※ 시설 안내 페이지 URL: https://library.cnu.ac.kr/webcontent/info/326
-
-### 대출/예약 요청인 경우
-- 로그인 필요 → 로그인 먼저 → 해당 작업 수행
-
-## 충남대 도서관 사이트 정보
-- 검색창: input[name='q']
-- 검색버튼: input.searchBtn
-- 로그인 폼: input#id (학번), input[name='password'] (비밀번호)
-- 팝업 닫기: a.infoClose
-- 시설안내 페이지: https://library.cnu.ac.kr/webcontent/info/326
-
-## 사용 가능한 액션
-- click: 요소 클릭 {{"action": "click", "selector": "CSS셀렉터"}}
-- type: 텍스트 입력 {{"action": "type", "selector": "CSS셀렉터", "value": "입력할텍스트"}}
-- press_key: 키 입력 {{"action": "press_key", "value": "Enter"}}
-- done: 작업 완료 {{"action": "done", "value": "결과요약"}}
-- navigate: 페이지 이동 {{"action": "navigate", "value": "URL"}}
-
-## 지시사항
-1. 목표를 먼저 파악하세요! "검색"이면 검색만, "로그인"이면 로그인만, "층별/위치/운영시간"이면 시설안내 페이지!
-2. 층별 안내/시설 위치/운영시간 질문이면: https://library.cnu.ac.kr/webcontent/info/326 로 이동 → 정보 확인 → done
-3. 검색 요청이면: 검색창(input[name='q'])에 입력 → 검색버튼 또는 Enter → done
-4. 로그인 요청이면: ID입력 → PW입력 → 로그인 버튼 클릭 → URL 변경 확인 → done
-5. Enter 눌렀는데 아직 로그인 페이지면 → 로그인 버튼(button, input[type='submit']) 클릭!
-6. 이미 한 액션은 반복하지 마세요!
-
-## 응답 형식 (JSON만 출력)
-{{"action": "액션명", "selector": "셀렉터(필요시)", "value": "값(필요시)", "reason": "이 액션을 선택한 이유"}}
 """
         
-        # LLM 호출
+        # 캐시 키는 프롬프트 전체 (목표 + 스냅샷 + 히스토리 + 페이지 요약)
+        # 스냅샷에는 입력값이 보이지 않으므로 히스토리가 빠지면 입력 직후 같은 액션이 반복 재생됨
+        cache_key = hashlib.blake2b(prompt.encode('utf-8', errors='replace'), digest_size=16).hexdigest()
+        self._last_cache_key = cache_key
+        cached = self._llm_cache.get(cache_key)
+        if cached is not None:
+            self._llm_cache.move_to_end(cache_key)
+            self.cache_hits += 1
+            print(f"[Agent] LLM cache hit ({self.cache_hits})", file=sys.stderr)
+            return copy.deepcopy(cached)
+        
+        # 완전 일치가 없으면 유사한 스냅샷의 액션 재사용 (선택 - URL과 히스토리가 같은 항목만 비교)
+        # 제목/건수/입력 상태만 다른 목록 페이지도 유사도가 높게 나오므로 다른 상태에서 재생되지 않도록 제한
+        snapshot_vec = None
+        semantic_context = (self.page.url, history_text)
+        if self.config.semantic_cache:
+            snapshot_vec = _snapshot_vector(snapshot_text)
+            candidates = [
+                (_cosine(snapshot_vec, vec), key, action)
+                for vec, key, action, context in self._semantic_cache if context == semantic_context
+            ]
+            best_sim, best_key, best_action = max(candidates, key=lambda item: item[0], default=(0.0, None, None))
+            if best_sim >= self.config.semantic_cache_threshold:
+                self._last_cache_key = best_key
+                self.cache_hits += 1
+                print(f"[Agent] LLM semantic cache hit (sim={best_sim:.3f})", file=sys.stderr)
+                return copy.deepcopy(best_action)
+        
+        # LLM 호출 (고정 지시사항은 system으로 분리)
         if self.llm_callback:
-            response = await self.llm_callback(prompt)
+            response = await self._call_llm(prompt, system=_SYSTEM_PROMPT)
         else:
             # 콜백 없으면 기본 동작 (테스트용)
             response = await self._default_llm_response(prompt)
         
         # JSON 파싱
         try:
-            # JSON 부분만 추출
-            json_match = re.search(r'\{[^{}]*\}', response, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
+            # JSON 부분만 추출 (중첩 객체도 처리)
+            json_text = _extract_json_object(response)
+            if json_text:
+                action_dict = json.loads(json_text)
+                # wait는 캐시하지 않음 (콜백 오류 시 대체 응답도 wait - 캐시하면 API를 다시 부르지 않고 계속 대기)
+                if action_dict.get('action') != 'wait':
+                    self._llm_cache[cache_key] = copy.deepcopy(action_dict)
+                    if len(self._llm_cache) > self._llm_cache_size:
+                        self._llm_cache.popitem(last=False)
+                    if snapshot_vec is not None:
+                        self._semantic_cache.append(
+                            (snapshot_vec, cache_key, copy.deepcopy(action_dict), semantic_context)
+                        )
+                return action_dict
             else:
                 print(f"[Agent] JSON 파싱 실패: {response[:200]}")
                 return None
@@ -389,6 +735,22 @@ class BrowserUseAgent:
             print(f"[Agent] JSON 파싱 오류: {e}")
             return None
     
+    async def _call_llm(self, prompt: str, system: Optional[str] = None) -> str:
+        """LLM 콜백 호출 (system 인자를 받지 않는 콜백이면 프롬프트 앞에 붙임)"""
+        if self._llm_accepts_system:
+            return await self.llm_callback(prompt, system=system)
+        if system:
+            prompt = f"{system}\n\n{prompt}"
+        return await self.llm_callback(prompt)
+    
+    def _forget_cached_action(self, cache_key: Optional[str]):
+        """실패한 액션을 완전 일치/유사 캐시에서 제거"""
+        self._llm_cache.pop(cache_key, None)
+        kept = [entry for entry in self._semantic_cache if entry[1] != cache_key]
+        if len(kept) != len(self._semantic_cache):
+            self._semantic_cache.clear()
+            self._semantic_cache.extend(kept)
+    
     async def _reflect_on_failure(self, action_dict: Dict, result: ActionResult) -> str:
         """실패 시 반성 및 분석"""
         
@@ -410,22 +772,18 @@ class BrowserUseAgent:
 """
         
         if self.llm_callback:
-            return await self.llm_callback(prompt)
+            return await self._call_llm(prompt)
         else:
             return f"액션 실패: {result.error}. 다른 셀렉터를 시도하거나 페이지 상태를 다시 확인해야 합니다."
     
     async def _post_summary(self, url: str) -> PageSummary:
         """페이지 전환 시 작업 요약 생성"""
         
-        # 해당 URL에서 수행한 액션들
-        url_actions = [
-            r for r in self.step_history 
-            if r.success and r.action.get('action') != 'wait'
-        ]
-        
+        # 최근 성공한 액션들 (wait 제외, 루프에서 누적)
+        recent = itertools.islice(self._success_tail, max(0, len(self._success_tail) - 5), None)
         completed = [
             f"{r.action.get('action')}: {r.action.get('selector', r.action.get('value', ''))}"
-            for r in url_actions[-5:]
+            for r in recent
         ]
         
         return PageSummary(
@@ -450,19 +808,32 @@ class BrowserUseAgent:
         return '{"action": "wait", "value": "2", "reason": "페이지 로딩 대기"}'
 
 
+@functools.lru_cache(maxsize=1)
+def _get_anthropic_client():
+    """Anthropic 클라이언트 (최초 호출 시 1회 생성)"""
+    import anthropic
+    return anthropic.Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+
+
+@functools.lru_cache(maxsize=2)
+def _get_openai_client(use_langfuse: bool):
+    """OpenAI 클라이언트 (Langfuse wrapper 사용 여부별 1회 생성)"""
+    if use_langfuse:
+        from langfuse.openai import openai
+    else:
+        import openai
+    return openai.OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+
+
 # Anthropic Claude API를 사용하는 LLM 콜백
-async def anthropic_llm_callback(prompt: str) -> str:
-    """Anthropic Claude API 호출 + Langfuse 추적"""
+async def anthropic_llm_callback(prompt: str, system: Optional[str] = None) -> str:
+    """Anthropic Claude API 호출 + Langfuse 추적 (system 프롬프트는 캐시 블록으로 전달)"""
     
     try:
-        import anthropic
+        # 인코딩 문제 해결: surrogate 문자 제거 (있을 때만 복사)
+        prompt_clean = _scrub_surrogates(prompt)
         
-        # 인코딩 문제 해결: surrogate 문자 제거
-        prompt_clean = prompt.encode('utf-8', errors='replace').decode('utf-8')
-        
-        client = anthropic.Anthropic(
-            api_key=os.environ.get("ANTHROPIC_API_KEY")
-        )
+        client = _get_anthropic_client()
         
         # Langfuse generation 추적
         generation = None
@@ -473,13 +844,19 @@ async def anthropic_llm_callback(prompt: str) -> str:
                 input=prompt_clean[:500] + "..." if len(prompt_clean) > 500 else prompt_clean
             )
         
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=1024,
-            messages=[
+        request = {
+            "model": "claude-sonnet-4-20250514",
+            "max_tokens": 1024,
+            "messages": [
                 {"role": "user", "content": prompt_clean}
             ]
-        )
+        }
+        if system:
+            request["system"] = [
+                {"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}
+            ]
+        
+        message = client.messages.create(**request)
         
         result = message.content[0].text
         
@@ -505,29 +882,24 @@ async def anthropic_llm_callback(prompt: str) -> str:
 
 
 # OpenAI API를 사용하는 LLM 콜백  
-async def openai_llm_callback(prompt: str) -> str:
-    """OpenAI API 호출 (Langfuse 자동 추적)"""
+async def openai_llm_callback(prompt: str, system: Optional[str] = None) -> str:
+    """OpenAI API 호출 (Langfuse 자동 추적, system 메시지를 앞에 두어 prefix 캐시 활용)"""
     
     try:
-        # 인코딩 문제 해결: surrogate 문자 제거
-        prompt_clean = prompt.encode('utf-8', errors='replace').decode('utf-8')
+        # 인코딩 문제 해결: surrogate 문자 제거 (있을 때만 복사)
+        prompt_clean = _scrub_surrogates(prompt)
         
         # Langfuse OpenAI wrapper 사용 (자동 추적)
-        if LANGFUSE_AVAILABLE:
-            from langfuse.openai import openai
-        else:
-            import openai
+        client = _get_openai_client(LANGFUSE_AVAILABLE)
         
-        client = openai.OpenAI(
-            api_key=os.environ.get("OPENAI_API_KEY")
-        )
+        messages = [{"role": "user", "content": prompt_clean}]
+        if system:
+            messages.insert(0, {"role": "system", "content": system})
         
         response = client.chat.completions.create(
             name="bua-action-selection",  # Langfuse에서 보이는 이름
             model="gpt-4o",
-            messages=[
-                {"role": "user", "content": prompt_clean}
-            ],
+            messages=messages,
             max_tokens=1024,
             metadata={"agent": "bua", "type": "action_selection"}
         )
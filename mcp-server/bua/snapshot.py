@@ -10,12 +10,164 @@ BUA Snapshot Module
 """
 
 import asyncio
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, asdict
-from playwright.async_api import Page, ElementHandle
+import json
+import re
+from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass
+from playwright.async_api import Page
 
+# 인터랙션 가능한 요소 태그
+INTERACTIVE_TAGS = [
+    'a', 'button', 'input', 'select', 'textarea',
+    'details', 'summary', '[onclick]', '[role="button"]',
+    '[role="link"]', '[role="tab"]', '[role="menuitem"]',
+    '[tabindex]'
+]
 
-@dataclass
+# 무시할 요소
+IGNORE_TAGS = ['script', 'style', 'noscript', 'meta', 'link', 'head']
+
+# 요소 조회용 복합 셀렉터 / 수집할 속성 (모듈 로드 시 1회 생성)
+_JOINED_SELECTOR = ', '.join(INTERACTIVE_TAGS)
+_ATTR_KEYS = ['id', 'name', 'class', 'type', 'href', 'placeholder', 'value',
+              'role', 'aria-label', 'title', 'alt', 'data-testid']
+
+# 페이지 본문 텍스트를 찾을 메인 컨텐츠 영역 (우선순위 순)
+PAGE_TEXT_SELECTORS = [
+    'main',
+    '.content',
+    '#content',
+    '.main-content',
+    'article',
+    '.article',
+    '.page-content',
+    '.view-content',
+    '.board-view',
+    '.sub_content',
+    '.cont_area'
+]
+
+# 페이지 유형 키워드 (URL은 영문, 제목은 한글) / 여러 유형이 걸릴 때의 우선순위
+_PAGE_TYPE_PRIORITY = ['login', 'search', 'detail', 'result', 'form', 'list']
+_PAGE_TYPE_URL_RE = re.compile(
+    r'(?P<login>login)|(?P<search>search)|(?P<detail>detail)|(?P<result>result)|(?P<form>form)|(?P<list>list)',
+    re.IGNORECASE
+)
+_PAGE_TYPE_TITLE_RE = re.compile(
+    r'(?P<login>로그인)|(?P<search>검색)|(?P<detail>상세)|(?P<result>결과)|(?P<form>신청|작성)|(?P<list>목록)'
+)
+
+# 요소 순회 공통 JS (extract()와 extract_text()가 같은 가시성 판정/셀렉터/텍스트를 쓰도록 한 곳에서 정의)
+# walkElements(셀렉터, 현재 화면 안의 요소만 포함할지, 최대 요소 수 - 이후 요소는 stats 개수만 집계)
+# 반환: {rows: [ElementInfo 필드명 그대로], stats: {count, clickable, editable, linkCount}}
+_ELEMENT_WALKER_JS = """function walkElements(selector, viewportOnly, max) {
+    const attrNames = """ + json.dumps(_ATTR_KEYS) + """;
+    const ignore = new Set(""" + json.dumps(IGNORE_TAGS) + """);
+    const rows = [];
+    const stats = {count: 0, clickable: 0, editable: 0, linkCount: 0};
+    const vh = window.innerHeight, vw = window.innerWidth;
+    const nodes = document.querySelectorAll(selector);
+    for (let i = 0; i < nodes.length; i++) {
+        const el = nodes[i];
+        const tag = el.tagName.toLowerCase();
+        if (ignore.has(tag)) continue;
+        const r = el.getBoundingClientRect();
+        if (r.width === 0 || r.height === 0) continue;
+        if (viewportOnly && (r.bottom < 0 || r.top > vh || r.right < 0 || r.left > vw)) continue;
+        const cs = getComputedStyle(el);
+        // 숨김 조상 아래 요소는 offsetParent가 null (position:fixed 요소는 원래 null이므로 제외)
+        if (cs.visibility === 'hidden' || cs.display === 'none') continue;
+        if (el.offsetParent === null && cs.position !== 'fixed' && tag !== 'body') continue;
+        const attrs = {};
+        for (const k of attrNames) { const v = el.getAttribute(k); if (v) attrs[k] = v; }
+        const isEditable = tag === 'input' || tag === 'textarea' || tag === 'select' || el.isContentEditable;
+        const isClickable = tag === 'a' || tag === 'button' || attrs.role === 'button';
+        stats.count += 1;
+        if (isClickable) stats.clickable += 1;
+        if (isEditable) stats.editable += 1;
+        if (tag === 'a') stats.linkCount += 1;
+        if (rows.length >= max) continue;
+        // CSS selector - 우선순위: id > name > data-testid > class(앞 2개) + tag
+        let sel;
+        if (attrs.id) sel = '#' + attrs.id;
+        else if (attrs.name) sel = tag + "[name='" + attrs.name + "']";
+        else if (attrs['data-testid']) sel = "[data-testid='" + attrs['data-testid'] + "']";
+        else sel = el.classList.length ? tag + '.' + Array.from(el.classList).slice(0, 2).join('.') : tag;
+        // bbox는 소수 첫째 자리로 반올림
+        rows.push({
+            tag: tag,
+            role: attrs.role || '',
+            text: (el.innerText || el.textContent || '').trim().slice(0, 100),
+            href: attrs.href || null,
+            placeholder: attrs.placeholder || null,
+            value: attrs.value || null,
+            bbox: {x: +r.x.toFixed(1), y: +r.y.toFixed(1), width: +r.width.toFixed(1), height: +r.height.toFixed(1)},
+            attributes: attrs,
+            selector: sel,
+            is_clickable: isClickable,
+            is_editable: isEditable
+        });
+    }
+    return {rows: rows, stats: stats};
+}"""
+
+# 인터랙션 가능한 요소 전체를 한 번에 추출 (보이지 않거나 크기 0인 요소 제외)
+# 인자: [셀렉터, 현재 화면 안의 요소만 포함할지, 최대 요소 수 (이후 요소는 개수만 집계)]
+# 반환: {elements: [...], stats: {count, clickable, editable, linkCount}} (페이지 유형 추정/요약용 개수는 페이지 전체 기준)
+_EXTRACT_ELEMENTS_JS = """([selector, viewportOnly, max]) => {
+    """ + _ELEMENT_WALKER_JS + """
+    const result = walkElements(selector, viewportOnly, max);
+    return {elements: result.rows, stats: result.stats};
+}"""
+
+# 페이지의 모든 폼 정보 (eval_on_selector_all 한 번으로 수집)
+_FORMS_JS = """forms => forms.map((form, i) => ({
+    index: i,
+    action: form.action || '',
+    method: form.method || 'get',
+    fields: Array.from(form.querySelectorAll('input, select, textarea')).map(el => ({
+        tag: el.tagName.toLowerCase(),
+        name: el.name || '',
+        type: el.type || '',
+        placeholder: el.placeholder || '',
+        required: !!el.required
+    }))
+}))"""
+
+# 스냅샷 텍스트 한 번에 생성 (snapshot_to_text와 같은 요소/폼/본문 형식, 요소는 walkElements 결과 사용)
+# 인자: {selector, maxElements, textSelectors, viewportOnly}
+_SNAPSHOT_TEXT_JS = """opts => {
+    """ + _ELEMENT_WALKER_JS + """
+    const result = walkElements(opts.selector, opts.viewportOnly, opts.maxElements);
+    const lines = result.rows.map((row, i) => {
+        let desc = '[' + (i + 1) + '] <' + row.tag + '>';
+        if (row.text) desc += " '" + row.text.slice(0, 30) + "'";
+        if (row.href) desc += " href='" + row.href.slice(0, 50) + "'";
+        if (row.placeholder) desc += " placeholder='" + row.placeholder + "'";
+        if (row.role) desc += " role='" + row.role + "'";
+        desc += ' | selector: ' + row.selector;
+        if (row.is_clickable) desc += ' [clickable]';
+        if (row.is_editable) desc += ' [editable]';
+        return desc;
+    });
+    const count = result.stats.count;
+    if (count > opts.maxElements) lines.push('... and ' + (count - opts.maxElements) + ' more elements');
+    const forms = Array.from(document.querySelectorAll('form')).map((form, i) =>
+        'Form ' + i + ': action=' + (form.action || '') + ', fields=' + form.querySelectorAll('input, select, textarea').length);
+    let pageText = '';
+    for (const sel of opts.textSelectors) {
+        const el = document.querySelector(sel);
+        const t = el ? (el.innerText || '').trim() : '';
+        if (t.length > 50) { pageText = t; break; }
+    }
+    if (!pageText && document.body) pageText = (document.body.innerText || '').trim();
+    if (pageText.length > 3000) pageText = pageText.slice(0, 3000) + '...';
+    return {title: document.title, lines: lines, forms: forms, pageText: pageText,
+            count: count, editable: result.stats.editable, links: result.stats.linkCount};
+}"""
+
+
+@dataclass(slots=True, frozen=True)
 class ElementInfo:
     """DOM 요소 정보"""
     index: int                    # 요소 인덱스 (LLM이 참조용)
@@ -33,7 +185,7 @@ class ElementInfo:
     attributes: Dict[str, str]    # 주요 속성들
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PageSnapshot:
     """페이지 스냅샷"""
     url: str
@@ -43,46 +195,101 @@ class PageSnapshot:
     page_type: str                # 페이지 유형 추정
     summary: str                  # 페이지 요약
     page_text: str = ""           # 페이지 본문 텍스트 (정보 페이지용)
+    element_count: int = 0        # 페이지 전체 요소 수 (elements는 max_elements개까지만 보관)
+    
+    def as_text(self, max_elements: int = 50) -> str:
+        """LLM 프롬프트용 텍스트 (snapshot_to_text와 같은 형식)"""
+        return _render_snapshot_text(self, max_elements)
 
 
 class SnapshotExtractor:
     """DOM 스냅샷 추출기"""
     
-    # 인터랙션 가능한 요소 태그
-    INTERACTIVE_TAGS = [
-        'a', 'button', 'input', 'select', 'textarea',
-        'details', 'summary', '[onclick]', '[role="button"]',
-        '[role="link"]', '[role="tab"]', '[role="menuitem"]',
-        '[tabindex]'
-    ]
-    
-    # 무시할 요소
-    IGNORE_TAGS = ['script', 'style', 'noscript', 'meta', 'link', 'head']
+    # 인터랙션 가능한 요소 태그 / 무시할 요소
+    INTERACTIVE_TAGS = INTERACTIVE_TAGS
+    IGNORE_TAGS = IGNORE_TAGS
     
-    def __init__(self, page: Page):
+    def __init__(self, page: Page, viewport_only: bool = False, max_elements: int = 200):
+        """
+        Args:
+            page: 대상 페이지
+            viewport_only: True면 현재 화면 안의 요소만 추출 (프롬프트 축소용, 기본은 스크롤 영역 전체)
+            max_elements: extract()에서 DOM 순서대로 수집할 최대 요소 수
+        """
         self.page = page
-        self.element_index = 0
+        self.viewport_only = viewport_only
+        self.max_elements = max_elements
+        # extract_text() 마지막 결과 (로그용)
+        self.last_page_type = "unknown"
+        self.last_element_count = 0
     
     async def extract(self) -> PageSnapshot:
         """페이지 스냅샷 추출"""
         import sys
         
-        self.element_index = 0
-        
         # 페이지 로딩 대기
         try:
             await self.page.wait_for_load_state("domcontentloaded", timeout=10000)
         except Exception as e:
             print(f"[Snapshot] Wait for load state: {e}", file=sys.stderr)
         
-        # URL과 제목 가져오기 (에러 처리)
+        # URL 가져오기 (에러 처리)
         try:
             url = self.page.url
         except:
             url = "unknown"
         
+        # 제목 / 인터랙션 가능한 요소 / 폼 정보 / 본문 텍스트는 서로 독립적이므로 동시에 조회
+        title, (elements, stats), forms, page_text = await asyncio.gather(
+            self._get_title(),
+            self._extract_interactive_elements(),
+            self._extract_forms(),
+            self._extract_page_text()
+        )
+        
+        # 페이지 유형 추정
+        page_type = self._infer_page_type(url, title, stats)
+        
+        # 페이지 요약 생성
+        summary = self._generate_summary(url, title, stats, forms)
+        
+        return PageSnapshot(
+            url=url,
+            title=title,
+            elements=elements,
+            forms=forms,
+            page_type=page_type,
+            summary=summary,
+            page_text=page_text,
+            element_count=stats['count']
+        )
+    
+    async def capture_both(self, path: str) -> Tuple[PageSnapshot, Optional[str]]:
+        """
+        스냅샷과 스크린샷을 동시에 수집 (DOM 추출과 렌더러 캡처는 서로 독립적)
+        
+        Returns:
+            (스냅샷, 저장된 스크린샷 경로 - 실패 시 None)
+        """
+        return await asyncio.gather(self.extract(), self._screenshot(path))
+    
+    async def _screenshot(self, path: str) -> Optional[str]:
+        """전체 페이지 스크린샷 저장 (실패해도 스냅샷은 반환되도록 None)"""
+        import sys
+        
+        try:
+            await self.page.screenshot(path=path, full_page=True)
+            return path
+        except Exception as e:
+            print(f"[Snapshot] Screenshot error: {e}", file=sys.stderr)
+            return None
+    
+    async def _get_title(self) -> str:
+        """페이지 제목 (페이지 이동 중이면 잠시 후 1회 재시도)"""
+        import sys
+        
         try:
-            title = await self.page.title()
+            return await self.page.title()
         except Exception as e:
             print(f"[Snapshot] Title error (navigation in progress?): {e}", file=sys.stderr)
             title = "Loading..."
@@ -92,201 +299,114 @@ class SnapshotExtractor:
                 title = await self.page.title()
             except:
                 pass
+            return title
+    
+    async def extract_text(self, max_elements: int = 50) -> str:
+        """
+        LLM 프롬프트용 스냅샷 텍스트를 브라우저에서 바로 생성
+        (ElementInfo/PageSnapshot을 만들지 않고 page.evaluate 한 번으로 snapshot_to_text와 같은 형식 반환)
+        """
+        import sys
         
-        # 인터랙션 가능한 요소들 추출
-        elements = await self._extract_interactive_elements()
+        try:
+            await self.page.wait_for_load_state("domcontentloaded", timeout=10000)
+        except Exception as e:
+            print(f"[Snapshot] Wait for load state: {e}", file=sys.stderr)
         
-        # 폼 정보 추출
-        forms = await self._extract_forms()
+        data = await self.page.evaluate(_SNAPSHOT_TEXT_JS, {
+            "selector": _JOINED_SELECTOR,
+            "maxElements": max_elements,
+            "textSelectors": PAGE_TEXT_SELECTORS,
+            "viewportOnly": self.viewport_only
+        })
         
-        # 페이지 유형 추정
-        page_type = self._infer_page_type(url, title, elements)
+        url = self.page.url
+        title = data["title"]
+        page_type = self._infer_page_type_from_counts(url, title, data["editable"], data["links"])
+        self.last_page_type = page_type
+        self.last_element_count = data["count"]
         
-        # 페이지 요약 생성
-        summary = self._generate_summary(url, title, elements, forms)
+        lines = [
+            "=== Page Snapshot ===",
+            f"URL: {url}",
+            f"Title: {title}",
+            f"Page Type: {page_type}",
+            "",
+            "=== Interactive Elements ==="
+        ]
+        lines.extend(data["lines"])
         
-        # 페이지 본문 텍스트 추출 (정보 페이지용)
-        page_text = await self._extract_page_text()
+        if data["forms"]:
+            lines.append("")
+            lines.append("=== Forms ===")
+            lines.extend(data["forms"])
         
-        return PageSnapshot(
-            url=url,
-            title=title,
-            elements=elements,
-            forms=forms,
-            page_type=page_type,
-            summary=summary,
-            page_text=page_text
-        )
+        if data["pageText"]:
+            lines.append("")
+            lines.append("=== Page Content (본문 텍스트) ===")
+            lines.append(data["pageText"])
+        
+        # 한글 인코딩 문제 해결 (전체 텍스트에 한 번만)
+        return "\n".join(lines).encode('utf-8', errors='replace').decode('utf-8')
     
-    async def _extract_interactive_elements(self) -> List[ElementInfo]:
-        """인터랙션 가능한 요소들 추출"""
-        elements = []
+    async def _extract_interactive_elements(self) -> Tuple[List[ElementInfo], Dict[str, int]]:
+        """
+        인터랙션 가능한 요소들 추출 (DOM 순회를 page.evaluate 한 번으로 처리)
         
-        # 복합 셀렉터로 한 번에 조회
-        selector = ', '.join(self.INTERACTIVE_TAGS)
+        Returns:
+            (요소 목록, {count, clickable, editable, linkCount} 개수 통계 - 페이지 전체 기준)
+        """
+        elements = []
+        stats = {'count': 0, 'clickable': 0, 'editable': 0, 'linkCount': 0}
         
         try:
-            handles = await self.page.query_selector_all(selector)
+            # 복합 셀렉터로 한 번에 조회
+            data = await self.page.evaluate(_EXTRACT_ELEMENTS_JS, [_JOINED_SELECTOR, self.viewport_only, self.max_elements])
+            stats = data['stats']
             
-            for handle in handles:
+            for i, row in enumerate(data['elements'], 1):
                 try:
-                    element_info = await self._extract_element_info(handle)
-                    if element_info and element_info.is_visible:
-                        elements.append(element_info)
+                    elements.append(self._element_from_row(row, i))
                 except Exception as e:
                     continue
         except Exception as e:
             import sys
             print(f"[Snapshot] Element extraction error: {e}", file=sys.stderr)
         
-        return elements
+        return elements, stats
     
-    async def _extract_element_info(self, handle: ElementHandle) -> Optional[ElementInfo]:
-        """단일 요소 정보 추출"""
-        try:
-            # 기본 정보 추출
-            tag = await handle.evaluate('el => el.tagName.toLowerCase()')
-            
-            # 무시할 태그 필터링
-            if tag in self.IGNORE_TAGS:
-                return None
-            
-            # 가시성 확인
-            is_visible = await handle.is_visible()
-            if not is_visible:
-                return None
-            
-            # Bounding box
-            bbox = await handle.bounding_box()
-            if not bbox or bbox['width'] == 0 or bbox['height'] == 0:
-                return None
-            
-            # 텍스트 내용
-            text = await handle.evaluate('el => el.innerText || el.textContent || ""')
-            text = text.strip()[:100] if text else ""  # 100자 제한
-            
-            # 속성들
-            attrs = await handle.evaluate('''el => {
-                const result = {};
-                ['id', 'name', 'class', 'type', 'href', 'placeholder', 'value', 
-                 'role', 'aria-label', 'title', 'alt', 'data-testid'].forEach(attr => {
-                    if (el.getAttribute(attr)) {
-                        result[attr] = el.getAttribute(attr);
-                    }
-                });
-                return result;
-            }''')
-            
-            # CSS selector 생성
-            selector = await self._generate_selector(handle, attrs)
-            
-            # 클릭/편집 가능 여부
-            is_clickable = tag in ['a', 'button'] or attrs.get('onclick') or attrs.get('role') == 'button'
-            is_editable = tag in ['input', 'textarea', 'select'] or await handle.evaluate('el => el.isContentEditable')
-            
-            self.element_index += 1
-            
-            return ElementInfo(
-                index=self.element_index,
-                tag=tag,
-                role=attrs.get('role', ''),
-                text=text,
-                href=attrs.get('href'),
-                placeholder=attrs.get('placeholder'),
-                value=attrs.get('value'),
-                bbox={
-                    'x': round(bbox['x'], 1),
-                    'y': round(bbox['y'], 1),
-                    'width': round(bbox['width'], 1),
-                    'height': round(bbox['height'], 1)
-                },
-                selector=selector,
-                is_clickable=is_clickable,
-                is_editable=is_editable,
-                is_visible=is_visible,
-                attributes=attrs
-            )
-            
-        except Exception as e:
-            return None
-    
-    async def _generate_selector(self, handle: ElementHandle, attrs: Dict) -> str:
-        """CSS selector 생성"""
-        # 우선순위: id > name > data-testid > class + tag
-        if attrs.get('id'):
-            return f"#{attrs['id']}"
-        if attrs.get('name'):
-            tag = await handle.evaluate('el => el.tagName.toLowerCase()')
-            return f"{tag}[name='{attrs['name']}']"
-        if attrs.get('data-testid'):
-            return f"[data-testid='{attrs['data-testid']}']"
-        
-        # 복합 셀렉터
-        try:
-            selector = await handle.evaluate('''el => {
-                const tag = el.tagName.toLowerCase();
-                const classes = Array.from(el.classList).slice(0, 2).join('.');
-                if (classes) return tag + '.' + classes;
-                return tag;
-            }''')
-            return selector
-        except:
-            return "unknown"
+    def _element_from_row(self, row: Dict[str, Any], index: int) -> ElementInfo:
+        """JS 추출 결과 1건 → ElementInfo (selector, 클릭/편집 가능 여부까지 JS에서 이미 정리되어 있음)"""
+        return ElementInfo(**row, index=index, is_visible=True)
     
     async def _extract_forms(self) -> List[Dict[str, Any]]:
         """폼 정보 추출"""
         forms = []
         
         try:
-            form_handles = await self.page.query_selector_all('form')
-            
-            for i, form in enumerate(form_handles):
-                form_info = await form.evaluate('''form => {
-                    const inputs = Array.from(form.querySelectorAll('input, select, textarea'));
-                    return {
-                        action: form.action || '',
-                        method: form.method || 'get',
-                        fields: inputs.map(el => ({
-                            tag: el.tagName.toLowerCase(),
-                            name: el.name || '',
-                            type: el.type || '',
-                            placeholder: el.placeholder || '',
-                            required: el.required || false
-                        }))
-                    };
-                }''')
-                form_info['index'] = i
-                forms.append(form_info)
-                
+            # 모든 폼을 한 번의 호출로 수집
+            forms = await self.page.eval_on_selector_all('form', _FORMS_JS)
         except Exception as e:
             import sys
             print(f"[Snapshot] Form extraction error: {e}", file=sys.stderr)
         
         return forms
     
-    def _infer_page_type(self, url: str, title: str, elements: List[ElementInfo]) -> str:
-        """페이지 유형 추정"""
-        url_lower = url.lower()
-        title_lower = title.lower()
-        
-        # URL/제목 기반 추정
-        if 'login' in url_lower or '로그인' in title_lower:
-            return 'login_page'
-        if 'search' in url_lower or '검색' in title_lower:
-            return 'search_page'
-        if 'detail' in url_lower or '상세' in title_lower:
-            return 'detail_page'
-        if 'result' in url_lower or '결과' in title_lower:
-            return 'result_page'
-        if 'form' in url_lower or '신청' in title_lower or '작성' in title_lower:
-            return 'form_page'
-        if 'list' in url_lower or '목록' in title_lower:
-            return 'list_page'
+    def _infer_page_type(self, url: str, title: str, stats: Dict[str, int]) -> str:
+        """페이지 유형 추정 (요소 개수는 JS 추출 시 집계한 stats 사용)"""
+        return self._infer_page_type_from_counts(url, title, stats['editable'], stats['linkCount'])
+    
+    def _infer_page_type_from_counts(self, url: str, title: str, editable_count: int, link_count: int) -> str:
+        """페이지 유형 추정 (URL/제목 + 편집 가능 요소 수/링크 수)"""
+        # URL/제목 기반 추정 (URL·제목을 각각 한 번씩만 스캔, 여러 유형이 걸리면 우선순위 순)
+        found = {m.lastgroup for m in _PAGE_TYPE_URL_RE.finditer(url)}
+        found.update(m.lastgroup for m in _PAGE_TYPE_TITLE_RE.finditer(title))
+        if found:
+            for page_type in _PAGE_TYPE_PRIORITY:
+                if page_type in found:
+                    return f"{page_type}_page"
         
         # 요소 기반 추정
-        editable_count = sum(1 for e in elements if e.is_editable)
-        link_count = sum(1 for e in elements if e.tag == 'a')
-        
         if editable_count >= 3:
             return 'form_page'
         if link_count >= 10:
@@ -295,17 +415,14 @@ class SnapshotExtractor:
         return 'unknown'
     
     def _generate_summary(self, url: str, title: str, 
-                          elements: List[ElementInfo], 
+                          stats: Dict[str, int], 
                           forms: List[Dict]) -> str:
-        """Generate page summary"""
-        clickable = [e for e in elements if e.is_clickable]
-        editable = [e for e in elements if e.is_editable]
-        
+        """Generate page summary (요소 개수는 JS 추출 시 집계한 stats 사용)"""
         summary_parts = [
             f"URL: {url}",
             f"Title: {title}",
-            f"Clickable: {len(clickable)}",
-            f"Editable: {len(editable)}",
+            f"Clickable: {stats['clickable']}",
+            f"Editable: {stats['editable']}",
             f"Forms: {len(forms)}"
         ]
         
@@ -314,22 +431,8 @@ class SnapshotExtractor:
     async def _extract_page_text(self) -> str:
         """페이지 본문 텍스트 추출 (정보 페이지용)"""
         try:
-            # 메인 컨텐츠 영역에서 텍스트 추출 시도
-            selectors = [
-                'main', 
-                '.content', 
-                '#content', 
-                '.main-content',
-                'article',
-                '.article',
-                '.page-content',
-                '.view-content',
-                '.board-view',
-                '.sub_content',
-                '.cont_area'
-            ]
-            
-            for selector in selectors:
+            # 메인 컨텐츠 영역에서 텍스트 추출 시도 (extract_text()와 같은 후보 목록)
+            for selector in PAGE_TEXT_SELECTORS:
                 try:
                     element = await self.page.query_selector(selector)
                     if element:
@@ -337,7 +440,6 @@ class SnapshotExtractor:
                         if text and len(text.strip()) > 50:
                             # 텍스트 정리 (너무 길면 자르기)
                             text = text.strip()
-                            text = text.encode('utf-8', errors='replace').decode('utf-8')
                             if len(text) > 3000:
                                 text = text[:3000] + "..."
                             return text
@@ -350,7 +452,6 @@ class SnapshotExtractor:
                 if body:
                     text = await body.inner_text()
                     text = text.strip()
-                    text = text.encode('utf-8', errors='replace').decode('utf-8')
                     if len(text) > 3000:
                         text = text[:3000] + "..."
                     return text
@@ -364,8 +465,27 @@ class SnapshotExtractor:
             return ""
 
 
-def snapshot_to_text(snapshot: PageSnapshot, max_elements: int = 50) -> str:
-    """Convert snapshot to text for LLM prompt"""
+def _element_line(elem: ElementInfo) -> str:
+    """요소 1건 → 스냅샷 텍스트 한 줄"""
+    parts = [f"[{elem.index}] <{elem.tag}>"]
+    if elem.text:
+        parts.append(f" '{elem.text[:30]}'")
+    if elem.href:
+        parts.append(f" href='{elem.href[:50]}'")
+    if elem.placeholder:
+        parts.append(f" placeholder='{elem.placeholder}'")
+    if elem.role:
+        parts.append(f" role='{elem.role}'")
+    parts.append(f" | selector: {elem.selector}")
+    if elem.is_clickable:
+        parts.append(" [clickable]")
+    if elem.is_editable:
+        parts.append(" [editable]")
+    return "".join(parts)
+
+
+def _render_snapshot_text(snapshot: PageSnapshot, max_elements: int) -> str:
+    """스냅샷 → 텍스트 (줄 목록을 모아 한 번에 join)"""
     lines = [
         "=== Page Snapshot ===",
         f"URL: {snapshot.url}",
@@ -374,39 +494,17 @@ def snapshot_to_text(snapshot: PageSnapshot, max_elements: int = 50) -> str:
         "",
         "=== Interactive Elements ==="
     ]
+    lines.extend(_element_line(elem) for elem in snapshot.elements[:max_elements])
     
-    for elem in snapshot.elements[:max_elements]:
-        elem_desc = f"[{elem.index}] <{elem.tag}>"
-        
-        if elem.text:
-            # 한글 인코딩 문제 해결
-            text_clean = elem.text[:30].encode('utf-8', errors='replace').decode('utf-8')
-            elem_desc += f" '{text_clean}'"
-        if elem.href:
-            elem_desc += f" href='{elem.href[:50]}'"
-        if elem.placeholder:
-            placeholder_clean = elem.placeholder.encode('utf-8', errors='replace').decode('utf-8')
-            elem_desc += f" placeholder='{placeholder_clean}'"
-        if elem.role:
-            elem_desc += f" role='{elem.role}'"
-        
-        elem_desc += f" | selector: {elem.selector}"
-        
-        if elem.is_clickable:
-            elem_desc += " [clickable]"
-        if elem.is_editable:
-            elem_desc += " [editable]"
-        
-        lines.append(elem_desc)
-    
-    if len(snapshot.elements) > max_elements:
-        lines.append(f"... and {len(snapshot.elements) - max_elements} more elements")
+    total = max(snapshot.element_count, len(snapshot.elements))
+    if total > max_elements:
+        lines.append(f"... and {total - max_elements} more elements")
     
     if snapshot.forms:
         lines.append("")
         lines.append("=== Forms ===")
-        for form in snapshot.forms:
-            lines.append(f"Form {form['index']}: action={form['action']}, fields={len(form['fields'])}")
+        lines.extend(f"Form {form['index']}: action={form['action']}, fields={len(form['fields'])}"
+                     for form in snapshot.forms)
     
     # 페이지 본문 텍스트 (정보 페이지용)
     if snapshot.page_text:
@@ -414,7 +512,13 @@ def snapshot_to_text(snapshot: PageSnapshot, max_elements: int = 50) -> str:
         lines.append("=== Page Content (본문 텍스트) ===")
         lines.append(snapshot.page_text)
     
-    return "\n".join(lines)
+    # 한글 인코딩 문제 해결 (필드마다가 아니라 전체 텍스트에 한 번만)
+    return "\n".join(lines).encode('utf-8', errors='replace').decode('utf-8')
+
+
+def snapshot_to_text(snapshot: PageSnapshot, max_elements: int = 50) -> str:
+    """Convert snapshot to text for LLM prompt"""
+    return snapshot.as_text(max_elements)
 
 
 # 테스트용
@@ -11,7 +11,8 @@ BUA Tools Module
 """
 
 import asyncio
-from typing import Dict, Any, Optional, List
+from collections import deque
+from typing import Dict, Any, Optional, Callable, Awaitable
 from dataclasses import dataclass
 from enum import Enum
 from playwright.async_api import Page
@@ -32,6 +33,42 @@ class ActionType(Enum):
     DONE = "done"  # Task completed
 
 
+# 액션 이름 → ActionType (enum 값이 곧 액션 이름, 모듈 로드 시 1회 생성)
+_ACTION_TYPE_MAP = {action_type.value: action_type for action_type in ActionType}
+
+# 요소가 나타나고 조작 가능해질 때까지 대기 (ms, 늦게 렌더링되는 요소 대비)
+_ELEMENT_TIMEOUT = 10000
+
+# 액션 후 대기 시간 (ms)
+_NAVIGATION_TIMEOUT = 3000   # 이동 요청이 나간 뒤 이동~DOM 로드까지
+_DOM_CHANGE_TIMEOUT = 500    # 액션 후 DOM 변경/이동 요청까지 (둘 다 없으면 그대로 진행)
+
+# 클릭 시 페이지 이동이 예상되는 요소인지 (링크 / 폼 제출 버튼)
+_NAVIGATES_JS = """el => {
+    const link = el.closest('a[href]');
+    if (link) {
+        const href = link.getAttribute('href') || '';
+        return !href.startsWith('#') && !href.toLowerCase().startsWith('javascript:') && link.target !== '_blank';
+    }
+    const button = el.closest('button, input[type=submit], input[type=image]');
+    return !!(button && button.form && (button.type === 'submit' || button.type === 'image'));
+}"""
+
+# 첫 DOM 변경(또는 timeout)까지 대기, 변경 여부 반환
+_DOM_CHANGE_JS = """timeout => new Promise(resolve => {
+    let timer = null;
+    const observer = new MutationObserver(() => finish(true));
+    const finish = changed => { observer.disconnect(); clearTimeout(timer); resolve(changed); };
+    observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+    timer = setTimeout(() => finish(false), timeout);
+})"""
+
+
+def _succeeded(task: asyncio.Task) -> bool:
+    """예외 없이 끝난 태스크인지"""
+    return task.done() and not task.cancelled() and task.exception() is None
+
+
 @dataclass
 class Action:
     """액션 정의"""
@@ -58,41 +95,33 @@ class BrowserTools:
     
     def __init__(self, page: Page):
         self.page = page
-        self.action_history: List[ActionResult] = []
+        # 최근 실행 결과만 보관하는 링 버퍼 (긴 세션에서도 메모리 일정) / 전체 실행 횟수
+        self.action_history: "deque[ActionResult]" = deque(maxlen=500)
+        self._action_counter = 0
+        
+        # 액션 유형 → 핸들러 (Action을 받아 코루틴 반환, 인스턴스 생성 시 1회 구성)
+        self._dispatch: Dict[ActionType, Callable[[Action], Awaitable[ActionResult]]] = {
+            ActionType.NAVIGATE: lambda a: self._navigate(a.value),
+            ActionType.CLICK: lambda a: self._click(a.selector),
+            ActionType.TYPE: lambda a: self._type(a.selector, a.value),
+            ActionType.SELECT: lambda a: self._select(a.selector, a.value),
+            ActionType.SCROLL: lambda a: self._scroll(a.value),
+            ActionType.WAIT: lambda a: self._wait(a.value),
+            ActionType.PRESS_KEY: lambda a: self._press_key(a.value),
+            ActionType.HOVER: lambda a: self._hover(a.selector),
+            ActionType.GO_BACK: lambda a: self._go_back(),
+            ActionType.SCREENSHOT: lambda a: self._screenshot(a.value),
+            ActionType.DONE: self._done,
+        }
     
     async def execute(self, action: Action) -> ActionResult:
         """액션 실행"""
         before_url = self.page.url
         
         try:
-            if action.action_type == ActionType.NAVIGATE:
-                result = await self._navigate(action.value)
-            elif action.action_type == ActionType.CLICK:
-                result = await self._click(action.selector)
-            elif action.action_type == ActionType.TYPE:
-                result = await self._type(action.selector, action.value)
-            elif action.action_type == ActionType.SELECT:
-                result = await self._select(action.selector, action.value)
-            elif action.action_type == ActionType.SCROLL:
-                result = await self._scroll(action.value)
-            elif action.action_type == ActionType.WAIT:
-                result = await self._wait(action.value)
-            elif action.action_type == ActionType.PRESS_KEY:
-                result = await self._press_key(action.value)
-            elif action.action_type == ActionType.HOVER:
-                result = await self._hover(action.selector)
-            elif action.action_type == ActionType.GO_BACK:
-                result = await self._go_back()
-            elif action.action_type == ActionType.SCREENSHOT:
-                result = await self._screenshot(action.value)
-            elif action.action_type == ActionType.DONE:
-                result = ActionResult(
-                    success=True,
-                    message="Task completed",
-                    action=action,
-                    before_url=before_url,
-                    after_url=self.page.url
-                )
+            handler = self._dispatch.get(action.action_type)
+            if handler is not None:
+                result = await handler(action)
             else:
                 result = ActionResult(
                     success=False,
@@ -104,6 +133,7 @@ class BrowserTools:
                 )
             
             self.action_history.append(result)
+            self._action_counter += 1
             return result
             
         except Exception as e:
@@ -116,15 +146,73 @@ class BrowserTools:
                 error=str(e)
             )
             self.action_history.append(result)
+            self._action_counter += 1
             return result
     
+    async def _done(self, action: Action) -> ActionResult:
+        """작업 완료 (브라우저 조작 없음)"""
+        return ActionResult(
+            success=True,
+            message="Task completed",
+            action=action,
+            before_url=self.page.url,
+            after_url=self.page.url
+        )
+    
+    async def _act_and_settle(self, act: Callable[[], Awaitable[Any]], expect_navigation: bool):
+        """
+        액션 실행 후 결과가 반영될 때까지 대기
+        - 이동 예상: 이동 완료와 첫 DOM 변경 중 먼저 오는 쪽까지
+          (이동 요청이 나갔으면 DOM 로드까지, 짧은 timeout 안에 이동 요청도 DOM 변경도 없으면 그대로 진행)
+        - 그 외: 첫 DOM 변경까지 (도중에 이동이 일어나면 DOM 로드까지)
+        액션 자체의 예외는 그대로 전달
+        """
+        if expect_navigation:
+            main_frame = self.page.main_frame
+            navigation_request = asyncio.create_task(self.page.wait_for_event(
+                "request", predicate=lambda r: r.is_navigation_request() and r.frame == main_frame,
+                timeout=_NAVIGATION_TIMEOUT
+            ))
+            navigated = asyncio.create_task(self.page.wait_for_event(
+                "framenavigated", predicate=lambda frame: frame == main_frame, timeout=_NAVIGATION_TIMEOUT
+            ))
+            waiters = [navigation_request, navigated]
+            try:
+                await act()
+                dom_change = asyncio.create_task(self.page.evaluate(_DOM_CHANGE_JS, _DOM_CHANGE_TIMEOUT))
+                waiters.append(dom_change)
+                await asyncio.wait({navigated, dom_change}, return_when=asyncio.FIRST_COMPLETED)
+                # 이동 요청 없이 DOM만 바뀌었거나(AJAX 제출, 오류 표시) 아무 변화가 없으면 바로 진행
+                # (DOM 변경 대기 중 실행 컨텍스트가 사라졌으면 이동 중)
+                if not navigated.done() and not _succeeded(navigation_request) and _succeeded(dom_change):
+                    return
+                try:
+                    await navigated
+                    await self.page.wait_for_load_state("domcontentloaded", timeout=_NAVIGATION_TIMEOUT)
+                except Exception:
+                    pass
+            finally:
+                for task in waiters:
+                    task.cancel()
+                await asyncio.gather(*waiters, return_exceptions=True)
+            return
+        
+        await act()
+        try:
+            await self.page.evaluate(_DOM_CHANGE_JS, _DOM_CHANGE_TIMEOUT)
+        except Exception:
+            # 실행 컨텍스트가 사라짐 = 페이지 이동 중
+            try:
+                await self.page.wait_for_load_state("domcontentloaded", timeout=_NAVIGATION_TIMEOUT)
+            except Exception:
+                pass
+    
     async def _navigate(self, url: str) -> ActionResult:
         """페이지 이동"""
         before_url = self.page.url
         
         try:
             await self.page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            await asyncio.sleep(1)
             
             return ActionResult(
                 success=True,
@@ -149,26 +237,14 @@ class BrowserTools:
         action = Action(ActionType.CLICK, selector=selector)
         
         try:
-            # 요소 찾기
-            element = await self.page.wait_for_selector(selector, timeout=10000)
-            
-            if not element:
-                return ActionResult(
-                    success=False,
-                    message=f"Element not found: {selector}",
-                    action=action,
-                    before_url=before_url,
-                    after_url=self.page.url,
-                    error="Element not found"
-                )
+            # 요소 찾기 (locator는 요소가 이미 있으면 바로 진행, 없을 때만 대기)
+            locator = self.page.locator(selector).first
             
-            # 클릭 가능할 때까지 대기
-            await element.scroll_into_view_if_needed()
-            await asyncio.sleep(0.3)
+            # 요소가 나타날 때까지 대기 후 이동 예상 여부 확인
+            expect_navigation = await locator.evaluate(_NAVIGATES_JS, timeout=_ELEMENT_TIMEOUT)
             
-            # 클릭
-            await element.click()
-            await asyncio.sleep(1)
+            # 클릭 (스크롤/조작 가능 대기는 click이 처리, 링크/제출 버튼이면 이동 후 DOM 로드까지 대기)
+            await self._act_and_settle(lambda: locator.click(timeout=_ELEMENT_TIMEOUT), expect_navigation)
             
             return ActionResult(
                 success=True,
@@ -194,23 +270,11 @@ class BrowserTools:
         action = Action(ActionType.TYPE, selector=selector, value=text)
         
         try:
-            element = await self.page.wait_for_selector(selector, timeout=10000)
-            
-            if not element:
-                return ActionResult(
-                    success=False,
-                    message=f"Element not found: {selector}",
-                    action=action,
-                    before_url=before_url,
-                    after_url=self.page.url,
-                    error="Element not found"
-                )
+            locator = self.page.locator(selector).first
             
-            # 기존 내용 지우고 입력
-            await element.click()
-            await element.fill("")
-            await element.fill(text)
-            await asyncio.sleep(0.5)
+            # 기존 내용 지우고 입력 (fill이 기존 값을 대체)
+            await locator.click(timeout=_ELEMENT_TIMEOUT)
+            await locator.fill(text, timeout=_ELEMENT_TIMEOUT)
             
             return ActionResult(
                 success=True,
@@ -236,25 +300,13 @@ class BrowserTools:
         action = Action(ActionType.SELECT, selector=selector, value=value)
         
         try:
-            element = await self.page.wait_for_selector(selector, timeout=10000)
-            
-            if not element:
-                return ActionResult(
-                    success=False,
-                    message=f"Element not found: {selector}",
-                    action=action,
-                    before_url=before_url,
-                    after_url=self.page.url,
-                    error="Element not found"
-                )
+            locator = self.page.locator(selector).first
             
             # value 또는 label로 선택 시도
             try:
-                await element.select_option(value=value)
+                await locator.select_option(value=value, timeout=_ELEMENT_TIMEOUT)
             except:
-                await element.select_option(label=value)
-            
-            await asyncio.sleep(0.5)
+                await locator.select_option(label=value, timeout=_ELEMENT_TIMEOUT)
             
             return ActionResult(
                 success=True,
@@ -289,8 +341,6 @@ class BrowserTools:
             elif direction == "bottom":
                 await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
             
-            await asyncio.sleep(0.5)
-            
             return ActionResult(
                 success=True,
                 message=f"Scroll completed: {direction}",
@@ -342,8 +392,8 @@ class BrowserTools:
         action = Action(ActionType.PRESS_KEY, value=key)
         
         try:
-            await self.page.keyboard.press(key)
-            await asyncio.sleep(0.5)
+            # Enter는 폼 제출로 이동하는 경우가 많으므로 이동 대기, 그 외 키는 DOM 변경까지
+            await self._act_and_settle(lambda: self.page.keyboard.press(key), expect_navigation=(key == "Enter"))
             
             return ActionResult(
                 success=True,
@@ -369,29 +419,17 @@ class BrowserTools:
         action = Action(ActionType.HOVER, selector=selector)
         
         try:
-            element = await self.page.wait_for_selector(selector, timeout=10000)
+            # hover는 요소가 안정될 때까지 자동 대기
+            await self.page.locator(selector).first.hover(timeout=_ELEMENT_TIMEOUT)
+            
+            return ActionResult(
+                success=True,
+                message=f"Hover completed: {selector}",
+                action=action,
+                before_url=before_url,
+                after_url=self.page.url
+            )
             
-            if element:
-                await element.hover()
-                await asyncio.sleep(0.5)
-                
-                return ActionResult(
-                    success=True,
-                    message=f"Hover completed: {selector}",
-                    action=action,
-                    before_url=before_url,
-                    after_url=self.page.url
-                )
-            else:
-                return ActionResult(
-                    success=False,
-                    message=f"Element not found: {selector}",
-                    action=action,
-                    before_url=before_url,
-                    after_url=self.page.url,
-                    error="Element not found"
-                )
-                
         except Exception as e:
             return ActionResult(
                 success=False,
@@ -408,8 +446,7 @@ class BrowserTools:
         action = Action(ActionType.GO_BACK)
         
         try:
-            await self.page.go_back()
-            await asyncio.sleep(1)
+            await self.page.go_back(wait_until="domcontentloaded")
             
             return ActionResult(
                 success=True,
@@ -434,7 +471,7 @@ class BrowserTools:
         before_url = self.page.url
         
         if not filename:
-            filename = f"screenshot_{len(self.action_history)}.png"
+            filename = f"screenshot_{self._action_counter}.png"
         
         action = Action(ActionType.SCREENSHOT, value=filename)
         
@@ -501,21 +538,7 @@ def parse_action_from_dict(action_dict: Dict[str, Any]) -> Action:
     """딕셔너리에서 Action 객체 생성"""
     action_type_str = action_dict.get("action", "").lower()
     
-    action_type_map = {
-        "navigate": ActionType.NAVIGATE,
-        "click": ActionType.CLICK,
-        "type": ActionType.TYPE,
-        "select": ActionType.SELECT,
-        "scroll": ActionType.SCROLL,
-        "wait": ActionType.WAIT,
-        "press_key": ActionType.PRESS_KEY,
-        "hover": ActionType.HOVER,
-        "go_back": ActionType.GO_BACK,
-        "screenshot": ActionType.SCREENSHOT,
-        "done": ActionType.DONE
-    }
-    
-    action_type = action_type_map.get(action_type_str, ActionType.WAIT)
+    action_type = _ACTION_TYPE_MAP.get(action_type_str, ActionType.WAIT)
     
     return Action(
         action_type=action_type,
@@ -10,6 +10,10 @@ import asyncio
 import json
 import sys
 import os
+import stat
+import traceback
+from typing import Optional
+from datetime import datetime
 
 # .env 파일 로드
 from dotenv import load_dotenv
@@ -27,40 +31,79 @@ from bua import (
     snapshot_to_text
 )
 from bua.agent import init_langfuse
+from bua.tools import Action, ActionType
+from stdin_reader import LineReader
+
+
+# ----------------------------
+# JSON 직렬화 (선택: orjson - 없거나 orjson이 처리 못하는 값이면 json 사용)
+# ----------------------------
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def dumps_pretty(obj) -> str:
+    """응답/출력용 JSON 문자열 (indent 2, 한글 그대로)"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2)
 
 
 # ----------------------------
 # 전역 에이전트 인스턴스
 # ----------------------------
 agent_instance: BrowserUseAgent = None
+_agent_lock = asyncio.Lock()
 
 
 async def get_agent() -> BrowserUseAgent:
-    """에이전트 싱글톤 인스턴스"""
+    """에이전트 싱글톤 인스턴스 (최초 초기화만 잠금, 초기화가 끝난 뒤에 전역에 등록)"""
     global agent_instance
     
     if agent_instance is None:
-        # Langfuse 초기화 (환경변수 있으면)
-        init_langfuse()
-        
-        config = AgentConfig(
-            headless=False,  # 브라우저 창 보이게!
-            max_steps=20
-        )
-        
-        # LLM 콜백 설정 (환경변수에 따라)
-        llm_callback = None
-        if os.environ.get("ANTHROPIC_API_KEY"):
-            llm_callback = anthropic_llm_callback
-        elif os.environ.get("OPENAI_API_KEY"):
-            llm_callback = openai_llm_callback
-        
-        agent_instance = BrowserUseAgent(config=config, llm_callback=llm_callback)
-        await agent_instance.initialize()
+        async with _agent_lock:
+            if agent_instance is None:
+                agent_instance = await _create_agent()
     
     return agent_instance
 
 
+async def _create_agent() -> BrowserUseAgent:
+    """에이전트 생성 및 브라우저 초기화"""
+    # Langfuse 초기화 (환경변수 있으면)
+    init_langfuse()
+    
+    config = AgentConfig(
+        headless=False,  # 브라우저 창 보이게!
+        max_steps=20
+    )
+    
+    # LLM 콜백 설정 (환경변수에 따라)
+    llm_callback = None
+    if os.environ.get("ANTHROPIC_API_KEY"):
+        llm_callback = anthropic_llm_callback
+    elif os.environ.get("OPENAI_API_KEY"):
+        llm_callback = openai_llm_callback
+    
+    agent = BrowserUseAgent(config=config, llm_callback=llm_callback)
+    await agent.initialize()
+    return agent
+
+
+async def warmup_agent():
+    """서버 기동 시 에이전트/브라우저 미리 준비 (실패하면 첫 tool 호출 때 다시 시도)"""
+    try:
+        await get_agent()
+    except Exception as e:
+        print(f"Agent warmup failed: {e}", file=sys.stderr)
+
+
 # ----------------------------
 # MCP Tool 정의
 # ----------------------------
@@ -100,7 +143,13 @@ TOOLS = {
         "description": "현재 페이지의 DOM 스냅샷을 가져옵니다. 페이지 구조와 클릭 가능한 요소들을 확인할 수 있습니다.",
         "parameters": {
             "type": "object",
-            "properties": {}
+            "properties": {
+                "screenshot": {
+                    "type": "string",
+                    "description": "지정하면 스냅샷과 함께 스크린샷도 이 파일명으로 저장 (선택사항)",
+                    "default": ""
+                }
+            }
         }
     },
     "browser_click": {
@@ -152,173 +201,255 @@ TOOLS = {
 # ----------------------------
 # Tool 실행 함수
 # ----------------------------
+async def _tool_agent_run(agent: BrowserUseAgent, params: dict) -> dict:
+    """에이전트 자동 실행"""
+    return await agent.run(
+        goal=params.get("goal"),
+        start_url=params.get("start_url") or None
+    )
+
+
+async def _tool_navigate(agent: BrowserUseAgent, params: dict) -> dict:
+    result = await agent.tools.execute(
+        Action(ActionType.NAVIGATE, value=params.get("url"))
+    )
+    return {"success": result.success, "message": result.message, "url": result.after_url}
+
+
+async def _tool_snapshot(agent: BrowserUseAgent, params: dict) -> dict:
+    screenshot = params.get("screenshot")
+    if screenshot:
+        # 스크린샷은 스냅샷 추출과 동시에 진행
+        snapshot, screenshot_path = await agent.snapshot_extractor.capture_both(screenshot)
+    else:
+        snapshot, screenshot_path = await agent.snapshot_extractor.extract(), None
+    result = {
+        "url": snapshot.url,
+        "title": snapshot.title,
+        "page_type": snapshot.page_type,
+        "elements_count": len(snapshot.elements),
+        "snapshot_text": snapshot_to_text(snapshot, max_elements=30)
+    }
+    if screenshot:
+        result["screenshot_path"] = screenshot_path
+    return result
+
+
+async def _tool_click(agent: BrowserUseAgent, params: dict) -> dict:
+    result = await agent.tools.execute(
+        Action(ActionType.CLICK, selector=params.get("selector"))
+    )
+    return {"success": result.success, "message": result.message}
+
+
+async def _tool_type(agent: BrowserUseAgent, params: dict) -> dict:
+    result = await agent.tools.execute(
+        Action(ActionType.TYPE, selector=params.get("selector"), value=params.get("text"))
+    )
+    return {"success": result.success, "message": result.message}
+
+
+async def _tool_screenshot(agent: BrowserUseAgent, params: dict) -> dict:
+    result = await agent.tools.execute(
+        Action(ActionType.SCREENSHOT, value=params.get("filename", "screenshot.png"))
+    )
+    return {"success": result.success, "message": result.message, "path": result.screenshot_path}
+
+
+# Tool 이름 → 실행 함수
+_TOOL_HANDLERS = {
+    "browser_agent_run": _tool_agent_run,
+    "browser_navigate": _tool_navigate,
+    "browser_snapshot": _tool_snapshot,
+    "browser_click": _tool_click,
+    "browser_type": _tool_type,
+    "browser_screenshot": _tool_screenshot,
+}
+
+
 async def execute_tool(tool_name: str, params: dict) -> dict:
-    """Tool 실행"""
-    agent = await get_agent()
-    
-    if tool_name == "browser_agent_run":
-        # 에이전트 자동 실행
-        result = await agent.run(
-            goal=params.get("goal"),
-            start_url=params.get("start_url") or None
-        )
-        return result
-    
-    elif tool_name == "browser_navigate":
-        from bua.tools import Action, ActionType
-        result = await agent.tools.execute(
-            Action(ActionType.NAVIGATE, value=params.get("url"))
-        )
-        return {"success": result.success, "message": result.message, "url": result.after_url}
-    
-    elif tool_name == "browser_snapshot":
-        snapshot = await agent.snapshot_extractor.extract()
-        return {
-            "url": snapshot.url,
-            "title": snapshot.title,
-            "page_type": snapshot.page_type,
-            "elements_count": len(snapshot.elements),
-            "snapshot_text": snapshot_to_text(snapshot, max_elements=30)
-        }
-    
-    elif tool_name == "browser_click":
-        from bua.tools import Action, ActionType
-        result = await agent.tools.execute(
-            Action(ActionType.CLICK, selector=params.get("selector"))
-        )
-        return {"success": result.success, "message": result.message}
+    """Tool 실행 (기동 시 초기화된 에이전트 사용, 아직 없으면 여기서 초기화)"""
+    agent = agent_instance or await get_agent()
     
-    elif tool_name == "browser_type":
-        from bua.tools import Action, ActionType
-        result = await agent.tools.execute(
-            Action(ActionType.TYPE, selector=params.get("selector"), value=params.get("text"))
-        )
-        return {"success": result.success, "message": result.message}
-    
-    elif tool_name == "browser_screenshot":
-        from bua.tools import Action, ActionType
-        result = await agent.tools.execute(
-            Action(ActionType.SCREENSHOT, value=params.get("filename", "screenshot.png"))
-        )
-        return {"success": result.success, "message": result.message, "path": result.screenshot_path}
-    
-    else:
+    handler = _TOOL_HANDLERS.get(tool_name)
+    if handler is None:
         return {"error": f"Unknown tool: {tool_name}"}
+    return await handler(agent, params)
 
 
 # ----------------------------
 # MCP 서버 핸들러
 # ----------------------------
-async def handle_mcp_request(request: dict) -> dict:
-    """MCP 요청 처리"""
-    method = request.get("method")
-    params = request.get("params", {})
-    request_id = request.get("id")
+# TOOLS는 정적이므로 tools/list 응답 목록도 1회만 생성
+_TOOLS_LIST = [
+    {
+        "name": name,
+        "description": info["description"],
+        "inputSchema": info["parameters"]
+    }
+    for name, info in TOOLS.items()
+]
+
+
+async def _h_initialize(request_id, params: dict) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "result": {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {"tools": {}},
+            "serverInfo": {
+                "name": "cnu-library-bua",
+                "version": "2.0.0"
+            }
+        }
+    }
+
+
+async def _h_tools_list(request_id, params: dict) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "result": {"tools": _TOOLS_LIST}
+    }
+
+
+async def _h_tools_call(request_id, params: dict) -> dict:
+    tool_name = params.get("name")
+    tool_args = params.get("arguments", {})
     
-    if method == "initialize":
+    try:
+        result = await execute_tool(tool_name, tool_args)
         return {
             "jsonrpc": "2.0",
             "id": request_id,
             "result": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {"tools": {}},
-                "serverInfo": {
-                    "name": "cnu-library-bua",
-                    "version": "2.0.0"
-                }
+                "content": [
+                    {"type": "text", "text": dumps_pretty(result)}
+                ]
             }
         }
-    
-    elif method == "tools/list":
-        tools_list = [
-            {
-                "name": name,
-                "description": info["description"],
-                "inputSchema": info["parameters"]
-            }
-            for name, info in TOOLS.items()
-        ]
+    except Exception as e:
         return {
             "jsonrpc": "2.0",
             "id": request_id,
-            "result": {"tools": tools_list}
+            "error": {"code": -32000, "message": str(e)}
         }
+
+
+async def _h_notification(request_id, params: dict) -> None:
+    return None  # 알림은 응답 불필요
+
+
+# MCP 메서드 → 처리 함수
+_HANDLERS = {
+    "initialize": _h_initialize,
+    "tools/list": _h_tools_list,
+    "tools/call": _h_tools_call,
+    "notifications/initialized": _h_notification,
+}
+
+
+async def handle_mcp_request(request: dict) -> dict:
+    """MCP 요청 처리"""
+    method = request.get("method")
+    params = request.get("params", {})
+    request_id = request.get("id")
     
-    elif method == "tools/call":
-        tool_name = params.get("name")
-        tool_args = params.get("arguments", {})
-        
-        try:
-            result = await execute_tool(tool_name, tool_args)
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {
-                    "content": [
-                        {"type": "text", "text": json.dumps(result, ensure_ascii=False, indent=2)}
-                    ]
-                }
-            }
-        except Exception as e:
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "error": {"code": -32000, "message": str(e)}
-            }
-    
-    elif method == "notifications/initialized":
-        return None  # 알림은 응답 불필요
-    
-    else:
+    handler = _HANDLERS.get(method)
+    if handler is None:
         return {
             "jsonrpc": "2.0",
             "id": request_id,
             "error": {"code": -32601, "message": f"Method not found: {method}"}
         }
+    return await handler(request_id, params)
 
 
-async def run_mcp_server():
-    """MCP 서버 실행 (stdio) - Windows 호환"""
-    import sys
-    
-    print("BUA MCP Server started", file=sys.stderr)
+# 요청 한 줄 최대 크기 (StreamReader 기본 64KiB는 긴 tool 인자에 부족)
+_STDIN_LINE_LIMIT = 16 * 1024 * 1024
+def _is_pipe(fd: int) -> bool:
+    """fd가 파이프 또는 소켓인지 (이벤트 루프에 읽기 등록이 가능한 경우)"""
+    try:
+        mode = os.fstat(fd).st_mode
+    except OSError:
+        return False
+    return stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode)
+
+
+async def open_stdin_reader():
+    """
+    stdin 비동기 readline 함수 생성 (요청 대기 중에도 이벤트 루프가 막히지 않도록)
+    - 기본: connect_read_pipe + StreamReader
+    - Windows, 파이프/소켓이 아닌 stdin(터미널, 파일, /dev/null): LineReader (stdin_reader 공용)
+      (tty는 stdout과 같은 장치라 non-blocking 전환 시 출력이 깨질 수 있고, 파일/장치는 epoll 등록 불가)
+    반환된 함수는 한 줄(bytes)을, 입력이 끝나면 None을 돌려줌
+    """
+    loop = asyncio.get_running_loop()
     
-    # Windows에서는 동기 I/O 사용
-    while True:
+    if sys.platform != "win32" and _is_pipe(sys.stdin.fileno()):
         try:
-            # stdin에서 한 줄 읽기 (동기)
-            line = sys.stdin.readline()
+            reader = asyncio.StreamReader(limit=_STDIN_LINE_LIMIT)
+            await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
             
-            if not line:
-                break
-            
-            line = line.strip()
-            if not line:
-                continue
+            async def readline() -> Optional[bytes]:
+                return (await reader.readline()) or None
             
+            return readline
+        except (ValueError, OSError, NotImplementedError) as e:
+            print(f"stdin pipe unavailable, using thread reader: {e}", file=sys.stderr)
+    
+    return LineReader(sys.stdin.fileno()).readline
+
+
+async def run_mcp_server():
+    """MCP 서버 실행 (stdio) - Windows 호환"""
+    print("BUA MCP Server started", file=sys.stderr)
+    
+    # 에이전트는 백그라운드에서 미리 초기화 (initialize 핸드셰이크는 기다리지 않음, 종료 시 정리하도록 참조 보관)
+    warmup_task = asyncio.create_task(warmup_agent())
+    
+    try:
+        readline = await open_stdin_reader()
+        
+        while True:
             try:
-                request = json.loads(line)
-                print(f"Request: {request.get('method')}", file=sys.stderr)
+                # stdin에서 한 줄 읽기 (비동기)
+                line = await readline()
                 
-                response = await handle_mcp_request(request)
+                if line is None:
+                    break
+                if not line or line.isspace():
+                    continue
                 
-                if response:
-                    response_str = json.dumps(response)
-                    print(response_str, flush=True)
-                    print(f"Response sent for: {request.get('method')}", file=sys.stderr)
+                try:
+                    # json.loads는 bytes와 앞뒤 공백(\r 등)을 그대로 처리
+                    request = json.loads(line)
+                    print(f"Request: {request.get('method')}", file=sys.stderr)
                     
-            except json.JSONDecodeError as e:
-                print(f"JSON decode error: {e}", file=sys.stderr)
-                
-        except Exception as e:
-            print(f"Error: {e}", file=sys.stderr)
-            import traceback
-            traceback.print_exc(file=sys.stderr)
-            break
-    
-    # 정리
-    if agent_instance:
-        await agent_instance.close()
+                    response = await handle_mcp_request(request)
+                    
+                    if response:
+                        response_str = json.dumps(response)
+                        print(response_str, flush=True)
+                        print(f"Response sent for: {request.get('method')}", file=sys.stderr)
+                        
+                except json.JSONDecodeError as e:
+                    print(f"JSON decode error: {e}", file=sys.stderr)
+                    
+            except Exception as e:
+                print(f"Error: {e}", file=sys.stderr)
+                traceback.print_exc(file=sys.stderr)
+                break
+    finally:
+        # 정리 (초기화가 끝나지 않았으면 취소)
+        warmup_task.cancel()
+        try:
+            await warmup_task
+        except asyncio.CancelledError:
+            pass
+        if agent_instance:
+            await agent_instance.close()
     
     print("BUA MCP Server stopped", file=sys.stderr)
 
@@ -326,11 +457,19 @@ async def run_mcp_server():
 # ----------------------------
 # CLI 모드
 # ----------------------------
+_cli_stdin: Optional[LineReader] = None
+
+
+async def ainput(prompt: str) -> str:
+    """입력 대기 (기다리는 동안 이벤트 루프의 브라우저 작업은 계속 진행, 입력이 끝나면 EOFError)"""
+    global _cli_stdin
+    if _cli_stdin is None:
+        _cli_stdin = LineReader(sys.stdin.fileno())
+    return await _cli_stdin.input(prompt)
+
+
 async def run_cli():
     """CLI 테스트 모드"""
-    import os
-    from datetime import datetime
-    
     print("=" * 60)
     print("BUA (Browser Use Agent) - CLI Mode")
     print("=" * 60)
@@ -354,7 +493,7 @@ async def run_cli():
         print("  s. Save results to JSON")
         print("  q. Quit")
         
-        cmd = input("Select> ").strip()
+        cmd = (await ainput("Select> ")).strip()
         
         if cmd == "q":
             break
@@ -363,12 +502,12 @@ async def run_cli():
             results["session_end"] = datetime.now().isoformat()
             filename = f"bua_result_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
             with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(results, f, ensure_ascii=False, indent=2)
+                f.write(dumps_pretty(results))
             print(f"\nSaved to: {filename}")
             
         elif cmd == "1":
-            goal = input("Goal: ")
-            start_url = input("Start URL (Enter=skip): ").strip() or None
+            goal = await ainput("Goal: ")
+            start_url = (await ainput("Start URL (Enter=skip): ")).strip() or None
             result = await agent.run(goal, start_url)
             results["actions"].append({
                 "type": "agent_run",
@@ -377,10 +516,10 @@ async def run_cli():
                 "result": result,
                 "timestamp": datetime.now().isoformat()
             })
-            print(f"\nResult:\n{json.dumps(result, ensure_ascii=False, indent=2)}")
+            print(f"\nResult:\n{dumps_pretty(result)}")
             
         elif cmd == "2":
-            url = input("URL: ")
+            url = await ainput("URL: ")
             result = await execute_tool("browser_navigate", {"url": url})
             results["actions"].append({
                 "type": "navigate",
@@ -388,7 +527,7 @@ async def run_cli():
                 "result": result,
                 "timestamp": datetime.now().isoformat()
             })
-            print(f"\nResult:\n{json.dumps(result, ensure_ascii=False, indent=2)}")
+            print(f"\nResult:\n{dumps_pretty(result)}")
             
         elif cmd == "3":
             result = await execute_tool("browser_snapshot", {})
@@ -397,10 +536,10 @@ async def run_cli():
                 "result": result,
                 "timestamp": datetime.now().isoformat()
             })
-            print(f"\nResult:\n{json.dumps(result, ensure_ascii=False, indent=2)}")
+            print(f"\nResult:\n{dumps_pretty(result)}")
             
         elif cmd == "4":
-            selector = input("Selector: ")
+            selector = await ainput("Selector: ")
             result = await execute_tool("browser_click", {"selector": selector})
             results["actions"].append({
                 "type": "click",
@@ -408,11 +547,11 @@ async def run_cli():
                 "result": result,
                 "timestamp": datetime.now().isoformat()
             })
-            print(f"\nResult:\n{json.dumps(result, ensure_ascii=False, indent=2)}")
+            print(f"\nResult:\n{dumps_pretty(result)}")
             
         elif cmd == "5":
-            selector = input("Selector: ")
-            text = input("Text: ")
+            selector = await ainput("Selector: ")
+            text = await ainput("Text: ")
             result = await execute_tool("browser_type", {"selector": selector, "text": text})
             results["actions"].append({
                 "type": "type",
@@ -421,11 +560,10 @@ async def run_cli():
                 "result": result,
                 "timestamp": datetime.now().isoformat()
             })
-            print(f"\nResult:\n{json.dumps(result, ensure_ascii=False, indent=2)}")
+            print(f"\nResult:\n{dumps_pretty(result)}")
             
         elif cmd == "6":
-            key = input("Key (Enter/Tab/Escape/etc): ")
-            from bua.tools import Action, ActionType
+            key = await ainput("Key (Enter/Tab/Escape/etc): ")
             result = await agent.tools.execute(Action(ActionType.PRESS_KEY, value=key))
             result_dict = {"success": result.success, "message": result.message}
             results["actions"].append({
@@ -434,13 +572,13 @@ async def run_cli():
                 "result": result_dict,
                 "timestamp": datetime.now().isoformat()
             })
-            print(f"\nResult:\n{json.dumps(result_dict, ensure_ascii=False, indent=2)}")
+            print(f"\nResult:\n{dumps_pretty(result_dict)}")
     
     # 종료 시 자동 저장
     results["session_end"] = datetime.now().isoformat()
     filename = f"bua_result_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
     with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+        f.write(dumps_pretty(results))
     print(f"\nResults saved to: {filename}")
     
     await agent.close()
@@ -450,6 +588,16 @@ async def run_cli():
 # 메인
 # ----------------------------
 if __name__ == "__main__":
+    # 이벤트 루프: 가능하면 uvloop (Windows는 stdio 서브프로세스 지원을 위해 Proactor 유지)
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+    else:
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
+    
     if "--mcp" in sys.argv:
         asyncio.run(run_mcp_server())
     else:
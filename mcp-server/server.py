@@ -9,34 +9,42 @@ CNU Library MCP Server (Extended)
 """
 
 import os
+import sys
 import re
 import json
 import asyncio
-from typing import Optional, List, Dict, Any
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, NamedTuple
 
 from dotenv import load_dotenv
 
-# MCP SDK
-from mcp.server import Server
-from mcp.server.stdio import stdio_server
-from mcp.types import (
-    Tool,
-    TextContent,
-    Resource,
-)
+from stdin_reader import LineReader
 
-# 도서 크롤러
-from book_crawler import (
-    BookCrawler,
-    search_book_async,
-    check_book_availability_async,
-    login_async,
-    request_pickup_async,
-    get_my_loans_async,
-)
+# MCP SDK / 도서 크롤러(Playwright)는 무거우므로 실제로 필요할 때 import
+# (시설 조회만 하는 CLI 실행은 바로 시작)
 
 load_dotenv()
 
+# ----------------------------
+# JSON 직렬화 (선택: orjson - 없거나 orjson이 처리 못하는 값이면 json 사용)
+# ----------------------------
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def dumps_pretty(obj) -> str:
+    """응답/출력용 JSON 문자열 (indent 2, 한글 그대로)"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2)
+
+
 # ----------------------------
 # 설정
 # ----------------------------
@@ -101,8 +109,14 @@ FACILITY_DATA = {
 }
 
 
+# 공백 문자 삭제용 변환 테이블 (정규식 \s와 같은 문자 집합 - 유니코드 공백 중 최대 코드포인트는 U+3000)
+_WS_TRANS = {c: None for c in range(0x3001) if chr(c).isspace()}
+
+
+# 질의/인자 문자열은 반복되는 경우가 많으므로 결과를 캐시 (순수 함수)
+@lru_cache(maxsize=4096)
 def norm(s: str) -> str:
-    return re.sub(r"\s+", "", (s or "").strip())
+    return (s or "").translate(_WS_TRANS)
 
 
 def flatten_facilities() -> List[Dict]:
@@ -120,27 +134,87 @@ def flatten_facilities() -> List[Dict]:
     return result
 
 
+class FacilityKeys(NamedTuple):
+    """시설 검색용 정규화 값 (필드별 배열, i번째가 FLAT_FACILITIES[i])"""
+    names: List[str]        # 이름
+    floors: List[str]       # 층
+    sections: List[str]     # 건물
+    namedescs: List[str]    # 이름 + 설명 (소문자)
+    shorts: List[str]       # 짧은 이름 (쉼표 앞부분, 표시/조회용 원문)
+    short_norms: List[str]  # 짧은 이름 (정규화)
+
+
+def facility_search_keys(facilities: List[Dict]) -> FacilityKeys:
+    """시설별 검색용 정규화 값 - 조회 때마다 norm()을 다시 돌리지 않도록 1회 계산"""
+    shorts = [f["name"].split(",", 1)[0] for f in facilities]
+    return FacilityKeys(
+        names=[norm(f["name"]) for f in facilities],
+        floors=[norm(f["floor"]) for f in facilities],
+        sections=[norm(f["section"]) for f in facilities],
+        namedescs=[(f["name"] + "\n" + f["desc"]).lower() for f in facilities],
+        shorts=shorts,
+        short_norms=[norm(sn) for sn in shorts]
+    )
+
+
 FLAT_FACILITIES = flatten_facilities()
+# FLAT_FACILITIES와 같은 순서 (결과 dict에 내부 키가 섞이지 않도록 별도 보관)
+_FACILITY_KEYS = facility_search_keys(FLAT_FACILITIES)
+
+# 공간 유형별 키워드 / 해당 시설 인덱스 (정적 데이터이므로 모듈 로드 시 1회 계산)
+INDIVIDUAL_KEYWORDS = frozenset(["열람실", "캐럴", "1인", "개인", "아우름"])
+GROUP_KEYWORDS = frozenset(["그룹", "스터디룸", "컨퍼런스", "세미나"])
+FOOD_KEYWORDS = frozenset(["카페", "매점", "북카페", "라운지", "99th"])
+
+
+def keyword_index(keywords: frozenset) -> tuple:
+    """이름/설명에 키워드가 하나라도 들어간 시설의 인덱스 (원래 데이터 순서)"""
+    lowered = [kw.lower() for kw in keywords]
+    return tuple(i for i, name_desc in enumerate(_FACILITY_KEYS.namedescs)
+                 if any(kw in name_desc for kw in lowered))
+
+
+_INDIVIDUAL_IDX = keyword_index(INDIVIDUAL_KEYWORDS)
+_GROUP_IDX = keyword_index(GROUP_KEYWORDS)
+_FOOD_IDX = keyword_index(FOOD_KEYWORDS)
+
+
+def _name_match_scan(fn: str) -> tuple:
+    """정규화된 이름이 서로 포함 관계인 시설 인덱스 (전체 순회)"""
+    return tuple(i for i, rn in enumerate(_FACILITY_KEYS.names) if fn in rn or rn in fn)
+
+
+# 정확한 시설 이름(정규화) → 이름 조건을 만족하는 시설 인덱스 (전체 순회와 같은 결과를 미리 계산)
+# LLM은 대부분 "북카페", "열람실"처럼 실제 시설 이름 그대로 질의하므로 dict 조회 한 번으로 끝남
+_EXACT_INDEX = {rn: _name_match_scan(rn) for rn in _FACILITY_KEYS.names}
+
+
+def name_matches(fn: str) -> tuple:
+    """이름 조건을 만족하는 시설 인덱스 (정확한 이름이면 미리 계산한 결과 사용)"""
+    indices = _EXACT_INDEX.get(fn)
+    return indices if indices is not None else _name_match_scan(fn)
 
 
 # ============================================================
 # 시설 관련 Tool 함수들
+# (정적 데이터 조회라 같은 인자면 결과가 같으므로 lru_cache로 재사용 - 반환 dict는 읽기 전용으로 취급)
 # ============================================================
 
+@lru_cache(maxsize=256)
 def search_facility(facility_name: str, floor: Optional[str] = None, section: Optional[str] = None) -> Dict[str, Any]:
     """시설 정보 검색"""
     results = []
     fn = norm(facility_name)
+    fl = norm(floor) if floor else None
+    sc = norm(section) if section else None
     
-    for f in FLAT_FACILITIES:
-        rn = norm(f["name"])
-        if fn not in rn and rn not in fn and fn != rn:
-            continue
-        if floor and norm(floor) not in norm(f["floor"]):
+    floors, sections = _FACILITY_KEYS.floors, _FACILITY_KEYS.sections
+    for i in name_matches(fn):
+        if fl is not None and fl not in floors[i]:
             continue
-        if section and norm(section) not in norm(f["section"]):
+        if sc is not None and sc not in sections[i]:
             continue
-        results.append(f)
+        results.append(FLAT_FACILITIES[i])
     
     return {
         "success": len(results) > 0,
@@ -151,20 +225,20 @@ def search_facility(facility_name: str, floor: Optional[str] = None, section: Op
     }
 
 
+@lru_cache(maxsize=256)
 def get_operating_hours(facility_name: str) -> Dict[str, Any]:
     """시설 운영시간 조회"""
     results = []
     fn = norm(facility_name)
     
-    for f in FLAT_FACILITIES:
-        rn = norm(f["name"])
-        if fn in rn or rn in fn:
-            results.append({
-                "name": f["name"],
-                "location": f"{f['section']} {f['floor']}",
-                "hours": f["hours"],
-                "description": f["desc"]
-            })
+    for i in name_matches(fn):
+        f = FLAT_FACILITIES[i]
+        results.append({
+            "name": f["name"],
+            "location": f"{f['section']} {f['floor']}",
+            "hours": f["hours"],
+            "description": f["desc"]
+        })
     
     return {
         "success": len(results) > 0,
@@ -174,18 +248,20 @@ def get_operating_hours(facility_name: str) -> Dict[str, Any]:
     }
 
 
+@lru_cache(maxsize=256)
 def list_floor_facilities(floor: str, section: Optional[str] = None) -> Dict[str, Any]:
     """특정 층의 모든 시설 조회"""
     results = []
     fl = norm(floor)
+    sc = norm(section) if section else None
     
-    for f in FLAT_FACILITIES:
-        rf = norm(f["floor"])
+    sections = _FACILITY_KEYS.sections
+    for i, rf in enumerate(_FACILITY_KEYS.floors):
         if fl not in rf and rf not in fl:
             continue
-        if section and norm(section) not in norm(f["section"]):
+        if sc is not None and sc not in sections[i]:
             continue
-        results.append(f)
+        results.append(FLAT_FACILITIES[i])
     
     return {
         "success": len(results) > 0,
@@ -197,18 +273,11 @@ def list_floor_facilities(floor: str, section: Optional[str] = None) -> Dict[str
     }
 
 
+@lru_cache(maxsize=256)
 def find_study_space(space_type: str = "individual") -> Dict[str, Any]:
     """학습 공간 찾기"""
-    individual_keywords = ["열람실", "캐럴", "1인", "개인", "아우름"]
-    group_keywords = ["그룹", "스터디룸", "컨퍼런스", "세미나"]
-    
-    keywords = individual_keywords if space_type == "individual" else group_keywords
-    
-    results = []
-    for f in FLAT_FACILITIES:
-        name_desc = f["name"] + f["desc"]
-        if any(kw in name_desc for kw in keywords):
-            results.append(f)
+    indices = _INDIVIDUAL_IDX if space_type == "individual" else _GROUP_IDX
+    results = [FLAT_FACILITIES[i] for i in indices]
     
     return {
         "success": len(results) > 0,
@@ -219,14 +288,10 @@ def find_study_space(space_type: str = "individual") -> Dict[str, Any]:
     }
 
 
+@lru_cache(maxsize=256)
 def find_food_places() -> Dict[str, Any]:
     """식사/음료 가능 장소 검색"""
-    keywords = ["카페", "매점", "북카페", "라운지", "99th"]
-    
-    results = []
-    for f in FLAT_FACILITIES:
-        if any(kw in f["name"] or kw in f["desc"] for kw in keywords):
-            results.append(f)
+    results = [FLAT_FACILITIES[i] for i in _FOOD_IDX]
     
     return {
         "success": len(results) > 0,
@@ -236,6 +301,7 @@ def find_food_places() -> Dict[str, Any]:
     }
 
 
+@lru_cache(maxsize=1)
 def get_all_facilities() -> Dict[str, Any]:
     """전체 시설 목록 조회"""
     return {
@@ -385,57 +451,88 @@ TOOLS = {
 
 
 # ============================================================
-# MCP Server 설정
+# 도서 크롤러 (지연 import)
 # ============================================================
 
-mcp_server = Server("cnu-library")
+_bc = None
 
 
-@mcp_server.list_tools()
-async def list_tools() -> List[Tool]:
-    """MCP Tool 목록 반환"""
-    tools = []
-    for name, info in TOOLS.items():
-        tools.append(Tool(
-            name=name,
-            description=info["description"],
-            inputSchema=info["parameters"]
-        ))
-    return tools
+def book_crawler():
+    """book_crawler 모듈 (Playwright를 끌어오므로 처음 필요할 때 1회 import)"""
+    global _bc
+    if _bc is None:
+        import book_crawler as module
+        _bc = module
+    return _bc
 
 
-@mcp_server.call_tool()
-async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
-    """MCP Tool 실행"""
-    if name not in TOOLS:
-        return [TextContent(type="text", text=f"Unknown tool: {name}")]
-    
-    try:
-        # 도서 관련 함수는 async 처리
-        if name == "search_book":
-            result = await search_book_async(**arguments)
-        elif name == "check_book_availability":
-            result = await check_book_availability_async(**arguments)
-        elif name == "library_login":
-            result = await login_async(**arguments)
-        elif name == "request_book_pickup":
-            result = await request_pickup_async(**arguments)
-        elif name == "get_my_loans":
-            result = await get_my_loans_async()
-        else:
-            # 동기 함수 (시설 관련)
-            func = TOOLS[name]["function"]
-            result = func(**arguments)
-        
-        return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
-    except Exception as e:
-        return [TextContent(type="text", text=f"Error: {str(e)}")]
+# ============================================================
+# Resource 데이터
+# ============================================================
 
+# Resource 내용은 정적 시설 데이터에서 나오므로 JSON 문자열을 미리 만들어 둠
+_FACILITIES_JSON = dumps_pretty(FLAT_FACILITIES)
+_HOURS_JSON = dumps_pretty(
+    [{"name": f["name"], "location": f"{f['section']} {f['floor']}", "hours": f["hours"]} for f in FLAT_FACILITIES]
+)
+_NOT_FOUND_JSON = json.dumps({"error": "Resource not found"})
+_RESOURCE_JSON = {
+    "library://facilities": _FACILITIES_JSON,
+    "library://hours": _HOURS_JSON,
+}
+
+
+# ============================================================
+# MCP Server 설정 (mcp SDK는 MCP 모드에서만 import)
+# ============================================================
 
-@mcp_server.list_resources()
-async def list_resources() -> List[Resource]:
-    """MCP Resource 목록"""
-    return [
+def create_mcp_server():
+    """MCP 서버 생성 및 핸들러 등록"""
+    from mcp.server import Server
+    from mcp.types import Tool, TextContent, Resource
+    
+    mcp_server = Server("cnu-library")
+    
+    # TOOLS는 정적이므로 Tool 객체 목록도 1회만 생성
+    tools_list = [
+        Tool(name=name, description=info["description"], inputSchema=info["parameters"])
+        for name, info in TOOLS.items()
+    ]
+    
+    @mcp_server.list_tools()
+    async def list_tools() -> List[Tool]:
+        """MCP Tool 목록 반환"""
+        return tools_list
+    
+    @mcp_server.call_tool()
+    async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
+        """MCP Tool 실행"""
+        if name not in TOOLS:
+            return [TextContent(type="text", text=f"Unknown tool: {name}")]
+        
+        try:
+            # 도서 관련 함수는 async 처리
+            if name == "search_book":
+                result = await book_crawler().search_book_async(**arguments)
+            elif name == "check_book_availability":
+                result = await book_crawler().check_book_availability_async(**arguments)
+            elif name == "library_login":
+                result = await book_crawler().login_async(**arguments)
+            elif name == "request_book_pickup":
+                result = await book_crawler().request_pickup_async(**arguments)
+            elif name == "get_my_loans":
+                result = await book_crawler().get_my_loans_async()
+            else:
+                # 동기 함수 (시설 관련)
+                func = TOOLS[name]["function"]
+                result = func(**arguments)
+            
+            return [TextContent(type="text", text=dumps_pretty(result))]
+        except Exception as e:
+            return [TextContent(type="text", text=f"Error: {str(e)}")]
+    
+    # Resource 목록도 정적이므로 1회만 생성
+    resources_list = [
         Resource(
             uri="library://facilities",
             name="전체 시설 목록",
@@ -449,53 +546,220 @@ async def list_resources() -> List[Resource]:
             mimeType="application/json"
         )
     ]
-
-
-@mcp_server.read_resource()
-async def read_resource(uri: str) -> str:
-    """MCP Resource 읽기"""
-    if uri == "library://facilities":
-        return json.dumps(FLAT_FACILITIES, ensure_ascii=False, indent=2)
-    elif uri == "library://hours":
-        hours_data = [{"name": f["name"], "location": f"{f['section']} {f['floor']}", "hours": f["hours"]} for f in FLAT_FACILITIES]
-        return json.dumps(hours_data, ensure_ascii=False, indent=2)
-    else:
-        return json.dumps({"error": "Resource not found"})
+    
+    @mcp_server.list_resources()
+    async def list_resources() -> List[Resource]:
+        """MCP Resource 목록"""
+        return resources_list
+    
+    @mcp_server.read_resource()
+    async def read_resource(uri: str) -> str:
+        """MCP Resource 읽기"""
+        return _RESOURCE_JSON.get(str(uri), _NOT_FOUND_JSON)
+    
+    return mcp_server
 
 
 # ============================================================
 # MCP 서버 실행
 # ============================================================
 
+async def _warmup_book_crawler():
+    """도서 크롤러 미리 준비 (Playwright import는 스레드에서 - 이벤트 루프/핸드셰이크를 막지 않음)"""
+    await asyncio.to_thread(book_crawler)
+    await book_crawler().warmup()
+
+
 async def run_mcp_server():
     """MCP 서버 실행 (stdio)"""
-    async with stdio_server() as (read_stream, write_stream):
-        await mcp_server.run(read_stream, write_stream, mcp_server.create_initialization_options())
+    from mcp.server.stdio import stdio_server
+    
+    mcp_server = create_mcp_server()
+    # 브라우저는 백그라운드에서 미리 실행 (초기화 핸드셰이크는 기다리지 않음, 종료 시 정리하도록 참조 보관)
+    warmup_task = asyncio.create_task(_warmup_book_crawler())
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await mcp_server.run(read_stream, write_stream, mcp_server.create_initialization_options())
+    finally:
+        warmup_task.cancel()
+        try:
+            await warmup_task
+        except (asyncio.CancelledError, Exception):
+            pass
 
 
 # ============================================================
 # CLI 테스트
 # ============================================================
 
+# 질의 파싱용 정규식 (쿼리마다 패턴 캐시를 조회하지 않도록 미리 컴파일)
+_BOOK_STRIP_RE = re.compile(r"(책|도서|찾아|검색|있어|알려줘|줘|해줘|\?)")
+_FLOOR_RE = re.compile(r"(지하\s*\d+\s*층|\d+\s*층)")
+
+
+def short_name_index(keys: FacilityKeys) -> Dict[str, str]:
+    """정규화된 짧은 이름 → 짧은 이름 (중복 시 앞의 시설 우선, 데이터 순서 유지)"""
+    index = {}
+    for key, short in zip(keys.short_norms, keys.shorts):
+        index.setdefault(key, short)
+    return index
+
+
+_SHORT_NAME_INDEX = short_name_index(_FACILITY_KEYS)
+
+
+def facility_in_query(query_norm: str) -> Optional[str]:
+    """질의에 이름이 들어 있는 첫 번째 시설의 짧은 이름"""
+    return next((short for key, short in _SHORT_NAME_INDEX.items() if key and key in query_norm), None)
+
+
+# CLI 시작 안내 / 사용 예시 (정적 문자열이므로 한 번만 구성)
+_CLI_BANNER = "\n".join([
+    "=" * 60,
+    "CNU Library MCP Server (Extended)",
+    "=" * 60,
+    f"Facilities: {len(FLAT_FACILITIES)}",
+    f"Tools: {len(TOOLS)}",
+    "\n[시설 관련]",
+    "  - search_facility, get_operating_hours, list_floor_facilities",
+    "  - find_study_space, find_food_places, get_all_facilities",
+    "\n[도서 관련]",
+    "  - search_book, check_book_availability",
+    "  - library_login, request_book_pickup, get_my_loans",
+    "\nType 'q' to quit",
+    "=" * 60,
+]) + "\n"
+_CLI_USAGE = "\n".join([
+    "\n사용 예시:",
+    "  - '파이썬 책 찾아줘' - 도서 검색",
+    "  - '북카페 운영시간' - 시설 운영시간",
+    "  - '지하 1층에 뭐 있어?' - 층별 시설",
+]) + "\n"
+
+# 질의 의도별 키워드 (dict 순서 = 우선순위, 여러 의도가 섞이면 앞의 의도 우선)
+_INTENT_KEYWORDS = {
+    "book": ("책", "도서", "검색"),
+    "hours": ("운영", "시간", "언제"),
+    "floor": ("층",),
+    "food": ("카페", "매점", "먹"),
+    "study": ("스터디", "그룹"),
+}
+_INTENT_RE = re.compile("|".join(
+    f"(?P<{intent}>" + "|".join(map(re.escape, keywords)) + ")"
+    for intent, keywords in _INTENT_KEYWORDS.items()
+))
+
+
+def query_intent(query: str) -> Optional[str]:
+    """질의 의도 분류 (정규식 한 번 스캔 후 우선순위가 가장 높은 의도)"""
+    found = {m.lastgroup for m in _INTENT_RE.finditer(query)}
+    return next((intent for intent in _INTENT_KEYWORDS if intent in found), None)
+
+
+def merge_search_results(query: str, results: List[Dict]) -> Dict[str, Any]:
+    """검색어별 도서 검색 결과 병합 (같은 도서는 한 번만)"""
+    books, seen = [], set()
+    for r in results:
+        for b in r.get("books", []):
+            key = b.get("book_id") or (b.get("title"), b.get("call_number"))
+            if key not in seen:
+                seen.add(key)
+                books.append(b)
+    return {
+        "query": query,
+        "total_count": sum(r.get("total_count", 0) for r in results),
+        "books": books,
+        "success": any(r.get("success") for r in results),
+        "message": "; ".join(r["message"] for r in results if r.get("message"))
+    }
+
+
+async def _cli_book(query: str, query_norm: str):
+    search_term = _BOOK_STRIP_RE.sub("", query).strip()
+    if not search_term:
+        return
+    print(f"\n📖 '{search_term}' 도서 검색 중...")
+    # 쉼표로 여러 검색어를 주면 동시에 검색 후 병합
+    terms = [t.strip() for t in search_term.split(",") if t.strip()]
+    if len(terms) > 1:
+        results = await asyncio.gather(*(book_crawler().search_book_async(t, 5) for t in terms))
+        result = merge_search_results(search_term, results)
+    else:
+        result = await book_crawler().search_book_async(search_term, 5)
+    print(dumps_pretty(result))
+
+
+async def _cli_hours(query: str, query_norm: str):
+    name = facility_in_query(query_norm)
+    if name:
+        result = get_operating_hours(name)
+        print(dumps_pretty(result))
+
+
+async def _cli_floor(query: str, query_norm: str):
+    floor_match = _FLOOR_RE.search(query)
+    if floor_match:
+        result = list_floor_facilities(floor_match.group(1))
+        print(dumps_pretty(result))
+
+
+async def _cli_food(query: str, query_norm: str):
+    print(dumps_pretty(find_food_places()))
+
+
+async def _cli_study(query: str, query_norm: str):
+    print(dumps_pretty(find_study_space("group")))
+
+
+async def _cli_facility(query: str, query_norm: str):
+    """의도 키워드가 없는 질의 - 시설 이름으로 검색"""
+    name = facility_in_query(query_norm)
+    if name:
+        result = search_facility(name)
+        print(dumps_pretty(result))
+    else:
+        sys.stdout.write(_CLI_USAGE)
+
+
+_CLI_HANDLERS = {
+    "book": _cli_book,
+    "hours": _cli_hours,
+    "floor": _cli_floor,
+    "food": _cli_food,
+    "study": _cli_study,
+    None: _cli_facility,
+}
+
+# 자동완성 후보에 추가할 자주 쓰는 질의어
+_CLI_EXTRA_WORDS = ("운영시간", "스터디", "카페", "매점", "도서", "책")
+
+
+def cli_prompt_session():
+    """시설 이름 자동완성 입력 세션 (선택: prompt_toolkit - 없거나 터미널이 아니면 None)"""
+    if not sys.stdin.isatty():
+        return None
+    try:
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.completion import WordCompleter
+    except ImportError:
+        return None
+    words = list(dict.fromkeys(_FACILITY_KEYS.shorts + list(_CLI_EXTRA_WORDS)))
+    return PromptSession(completer=WordCompleter(words, ignore_case=True))
+
+
 async def run_cli_async():
     """CLI 모드 (async)"""
-    print("=" * 60)
-    print("CNU Library MCP Server (Extended)")
-    print("=" * 60)
-    print(f"Facilities: {len(FLAT_FACILITIES)}")
-    print(f"Tools: {len(TOOLS)}")
-    print("\n[시설 관련]")
-    print("  - search_facility, get_operating_hours, list_floor_facilities")
-    print("  - find_study_space, find_food_places, get_all_facilities")
-    print("\n[도서 관련]")
-    print("  - search_book, check_book_availability")
-    print("  - library_login, request_book_pickup, get_my_loans")
-    print("\nType 'q' to quit")
-    print("=" * 60)
+    sys.stdout.write(_CLI_BANNER)
+    
+    session = cli_prompt_session()
+    stdin_lines = LineReader(sys.stdin.fileno())
     
     while True:
         try:
-            query = input("\nQuery> ").strip()
+            if session is not None:
+                query = (await session.prompt_async("\nQuery> ")).strip()
+            else:
+                query = (await stdin_lines.input("\nQuery> ")).strip()
         except EOFError:
             break
             
@@ -505,54 +769,10 @@ async def run_cli_async():
             print("Bye!")
             break
         
-        query_lower = query.lower()
         query_norm = norm(query)
         
-        # 도서 검색
-        if "책" in query or "도서" in query or "검색" in query:
-            search_term = re.sub(r"(책|도서|찾아|검색|있어|알려줘|줘|해줘|\?)", "", query).strip()
-            if search_term:
-                print(f"\n📖 '{search_term}' 도서 검색 중...")
-                result = await search_book_async(search_term, 5)
-                print(json.dumps(result, ensure_ascii=False, indent=2))
-            continue
-        
-        # 시설 관련
-        if "운영" in query or "시간" in query or "언제" in query:
-            for f in FLAT_FACILITIES:
-                if norm(f["name"].split(",")[0]) in query_norm:
-                    result = get_operating_hours(f["name"].split(",")[0])
-                    print(json.dumps(result, ensure_ascii=False, indent=2))
-                    break
-        
-        elif "층" in query:
-            floor_match = re.search(r"(지하\s*\d+\s*층|\d+\s*층)", query)
-            if floor_match:
-                result = list_floor_facilities(floor_match.group(1))
-                print(json.dumps(result, ensure_ascii=False, indent=2))
-        
-        elif "카페" in query or "매점" in query or "먹" in query:
-            result = find_food_places()
-            print(json.dumps(result, ensure_ascii=False, indent=2))
-        
-        elif "스터디" in query or "그룹" in query:
-            result = find_study_space("group")
-            print(json.dumps(result, ensure_ascii=False, indent=2))
-        
-        else:
-            found = False
-            for f in FLAT_FACILITIES:
-                if norm(f["name"].split(",")[0]) in query_norm:
-                    result = search_facility(f["name"].split(",")[0])
-                    print(json.dumps(result, ensure_ascii=False, indent=2))
-                    found = True
-                    break
-            
-            if not found:
-                print("\n사용 예시:")
-                print("  - '파이썬 책 찾아줘' - 도서 검색")
-                print("  - '북카페 운영시간' - 시설 운영시간")
-                print("  - '지하 1층에 뭐 있어?' - 층별 시설")
+        handler = _CLI_HANDLERS[query_intent(query)]
+        await handler(query, query_norm)
 
 
 def run_cli():
@@ -561,7 +781,15 @@ def run_cli():
 
 
 if __name__ == "__main__":
-    import sys
+    # 이벤트 루프: 가능하면 uvloop (Windows는 stdio 서브프로세스 지원을 위해 Proactor 유지)
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+    else:
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
     
     if len(sys.argv) > 1 and sys.argv[1] == "--mcp":
         asyncio.run(run_mcp_server())
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+stdin 줄 단위 비동기 읽기
+server.py(CLI) / bua_server.py(MCP, CLI) 공용
+
+사용법:
+    from stdin_reader import LineReader
+    
+    reader = LineReader(sys.stdin.fileno())
+    line = await reader.readline()          # bytes, 입력이 끝나면 None
+    query = await reader.input("Query> ")   # str, 입력이 끝나면 EOFError
+"""
+
+import asyncio
+import os
+import sys
+from typing import Optional
+
+
+# 한 번에 읽을 크기
+_STDIN_CHUNK_SIZE = 65536
+
+
+class LineReader:
+    """
+    stdin 줄 단위 비동기 읽기 (os.read로 64KiB씩 읽어 버퍼에서 줄 분리)
+    클라이언트가 요청을 몰아 보내면 읽기 한 번으로 여러 줄을 처리
+    - Windows 외: 이벤트 루프에 읽기 대기 등록 후 읽기 (대기 중인 스레드가 없어 Ctrl-C 시 바로 종료)
+    - Windows, 등록이 안 되는 fd(일반 파일, /dev/null): 스레드 풀에서 os.read
+    """
+    
+    def __init__(self, fd: int):
+        self.fd = fd
+        self.buf = bytearray()
+        self.eof = False
+        self.use_selector = sys.platform != "win32"
+    
+    async def _read_chunk(self) -> bytes:
+        loop = asyncio.get_running_loop()
+        if self.use_selector:
+            readable = loop.create_future()
+            try:
+                loop.add_reader(self.fd, lambda: readable.done() or readable.set_result(None))
+            except (NotImplementedError, OSError, ValueError):
+                self.use_selector = False
+            else:
+                try:
+                    await readable
+                finally:
+                    loop.remove_reader(self.fd)
+                return os.read(self.fd, _STDIN_CHUNK_SIZE)
+        return await loop.run_in_executor(None, os.read, self.fd, _STDIN_CHUNK_SIZE)
+    
+    async def readline(self) -> Optional[bytes]:
+        """다음 한 줄 (개행 제외), 입력이 끝나면 None"""
+        while True:
+            i = self.buf.find(b"\n")
+            if i >= 0:
+                line = bytes(self.buf[:i])
+                del self.buf[:i + 1]
+                return line
+            if self.eof:
+                break
+            chunk = await self._read_chunk()
+            if chunk:
+                self.buf.extend(chunk)
+            else:
+                self.eof = True
+        
+        # 마지막 줄에 개행이 없는 경우
+        if self.buf:
+            line = bytes(self.buf)
+            self.buf.clear()
+            return line
+        return None
+    
+    async def input(self, prompt: str) -> str:
+        """프롬프트 출력 후 한 줄 (input()과 같이 개행 제외 문자열), 입력이 끝나면 EOFError"""
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+        line = await self.readline()
+        if line is None:
+            raise EOFError
+        return line.decode("utf-8", errors="replace").rstrip("\r")